@@ -162,7 +162,8 @@ def import_contacts_dialog():
         col_map = st.session_state.col_map
         valid_contacts, invalid_contacts = [], []
 
-        for index, row in df.iterrows():
+        # Filas como dicts (sin construir un Series por fila); las claves son los nombres de columna
+        for row in df.to_dict('records'):
             name = str(row[col_map['name']]) if col_map['name'] != '-- No usar --' and col_map['name'] in row else ""
 
             # Procesar emails usando la función mejorada de limpieza
@@ -503,7 +504,7 @@ with col_contacts:
             header_cols[5].markdown("<div style='text-align: center;'>Editar</div>", unsafe_allow_html=True)
             st.markdown("<hr style='margin-top:0; margin-bottom:1rem; border-color: #444;'>", unsafe_allow_html=True)
 
-            for index, row in df.iterrows():
+            for row in df.to_dict('records'):
                 contact_id = row['id']
                 cols = st.columns([0.5, 4, 4, 3, 3, 1.5])
                 cols[0].checkbox(
@@ -5,20 +5,36 @@ from src.auth import check_password
 if not check_password():
     st.stop()
 
-from datetime import datetime
-import pandas as pd
+from collections import defaultdict
+from datetime import datetime, timedelta
 
-from src.db_config import get_programmed_posts, get_unprogrammed_posts, get_programmed_posts_by_platform, get_unprogrammed_posts_by_platform, get_sent_posts, get_sent_posts_by_platform
+from src.db_config import get_programmed_posts, get_unprogrammed_posts, get_sent_posts
 from src.ui_components import display_posts, display_post_editor
 from src.state import init_states
 
+# Opciones de los filtros (constantes, no se recrean en cada rerun)
+PLATFORMS = ("LinkedIn", "Instagram", "WordPress", "Gmail", "WhatsApp")
+SORT_SCHEDULED = ("Fecha (ascendente)", "Fecha (descendente)", "Plataforma")
+SORT_SAVED = ("Fecha de creación (reciente primero)", "Fecha de creación (antiguo primero)", "Plataforma")
+SORT_HISTORY = ("Fecha de envío (reciente primero)", "Fecha de envío (antiguo primero)", "Plataforma")
+
+# Divisor vertical del panel del editor (se aplica a la clase del contenedor con key="editor_panel")
+_PAGE_CSS = """
+<style>
+    .st-key-editor_panel { border-left: 2px solid #e6e6e6; padding-left: 1rem; min-height: 70vh; }
+</style>
+"""
+
 init_states()
 st.set_page_config(layout="wide")
 
 if st.session_state.get('force_page_rerun', False):
     st.session_state.force_page_rerun = False
 
-    st.cache_data.clear()
+    # Invalidar solo las cachés de publicaciones, no las del resto de páginas
+    get_programmed_posts.clear()
+    get_unprogrammed_posts.clear()
+    get_sent_posts.clear()
 
     st.rerun()
 
@@ -26,11 +42,15 @@ st.title("📝 Gestión de Publicaciones")
 st.markdown("Edita, programa o elimina las publicaciones que has creado.")
 
 # Estado inicial
-if 'selected_pub_id' not in st.session_state:
-    st.session_state.selected_pub_id = None
+st.session_state.setdefault('selected_pub_id', None)
+
+# Fecha de referencia para los filtros de fechas
+today = datetime.now().date()
+
+st.markdown(_PAGE_CSS, unsafe_allow_html=True)
 
 # Crear estructura de dos columnas
-col_left, empty_col, col_right = st.columns([5, 0.1, 5])
+col_left, col_right = st.columns(2, gap="medium")
 
 # Columna izquierda: listado de publicaciones
 with col_left:
@@ -45,8 +65,12 @@ with col_left:
             st.info("No hay publicaciones programadas. Programa alguna publicación desde la sección 'Publicaciones Guardadas'.")
         else:
 
-            # Buscador por título
-            titles = [post['title'] for post in programmed_posts if post['title']]
+            # Buscador por título (índice título -> posts construido una sola vez)
+            by_title = defaultdict(list)
+            for post in programmed_posts:
+                if post['title']:
+                    by_title[post['title']].append(post)
+            titles = list(by_title)
             selected_title = st.selectbox(
                 "🔍 Buscar publicación por título",
                 options=[""] + titles,
@@ -55,7 +79,7 @@ with col_left:
 
             # Filtrar por título si se seleccionó uno
             if selected_title:
-                programmed_posts = [post for post in programmed_posts if post['title'] == selected_title]
+                programmed_posts = by_title[selected_title]
 
             # Contenedor de filtros con estilo
             with st.container():
@@ -68,9 +92,9 @@ with col_left:
                 with col2:
                     date_range = st.date_input(
                         "Rango de fechas",
-                        value=(datetime.now().date(), datetime.now().date() + pd.Timedelta(days=30)),
-                        min_value=datetime.now().date() - pd.Timedelta(days=1),
-                        max_value=datetime.now().date() + pd.Timedelta(days=90),
+                        value=(today, today + timedelta(days=30)),
+                        min_value=today - timedelta(days=1),
+                        max_value=today + timedelta(days=90),
                         key="date_range_scheduled",
                         disabled=not usar_filtro_fecha
                     )
@@ -78,24 +102,20 @@ with col_left:
                 with col3:
                     platform_filter = st.multiselect(
                         "Filtrar por plataforma",
-                        options=["LinkedIn", "Instagram", "WordPress", "Gmail", "WhatsApp"],
+                        options=PLATFORMS,
                         default=[],
                         key="platform_filter_scheduled"
                     )
                 with col4:
                     sort_by = st.selectbox(
                         "Ordenar por",
-                        options=["Fecha (ascendente)", "Fecha (descendente)", "Plataforma"],
+                        options=SORT_SCHEDULED,
                         key="sort_by_scheduled"
                     )
 
-            # Filtrar según plataforma
-            if platform_filter:
-                filtered_posts = []
-                for platform in platform_filter:
-                    filtered_posts.extend(get_programmed_posts_by_platform(platform))
-            else:
-                filtered_posts = programmed_posts
+            # Filtrar según plataforma sobre los posts ya cargados (sin nuevas consultas)
+            pf_set = frozenset(platform_filter)
+            filtered_posts = [p for p in programmed_posts if p['platform'] in pf_set] if pf_set else programmed_posts
 
             # Mostrar publicaciones
             display_posts(filtered_posts, date_range, sort_by, 'scheduled', usar_filtro_fecha)
@@ -107,8 +127,12 @@ with col_left:
         if not unprogrammed_posts:
             st.info("No hay publicaciones guardadas. Crea publicaciones desde la página principal.")
         else:
-            # Buscador por título
-            titles = [post['title'] for post in unprogrammed_posts if post['title']]
+            # Buscador por título (índice título -> posts construido una sola vez)
+            by_title = defaultdict(list)
+            for post in unprogrammed_posts:
+                if post['title']:
+                    by_title[post['title']].append(post)
+            titles = list(by_title)
             selected_title = st.selectbox(
                 "🔍 Buscar publicación por título",
                 options=[""] + titles,
@@ -117,7 +141,7 @@ with col_left:
 
             # Filtrar por título si se seleccionó uno
             if selected_title:
-                unprogrammed_posts = [post for post in unprogrammed_posts if post['title'] == selected_title]
+                unprogrammed_posts = by_title[selected_title]
 
             # Contenedor de filtros con estilo
             with st.container():
@@ -125,24 +149,20 @@ with col_left:
                 with col1:
                     platform_filter = st.multiselect(
                         "Filtrar por plataforma",
-                        options=["LinkedIn", "Instagram", "WordPress", "Gmail", "WhatsApp"],
+                        options=PLATFORMS,
                         default=[],
                         key="platform_filter_saved"
                     )
                 with col2:
                     sort_by = st.selectbox(
                         "Ordenar por",
-                        options=["Fecha de creación (reciente primero)", "Fecha de creación (antiguo primero)", "Plataforma"],
+                        options=SORT_SAVED,
                         key="sort_by_saved"
                     )
 
-            # Filtrar según plataforma
-            if platform_filter:
-                filtered_posts = []
-                for platform in platform_filter:
-                    filtered_posts.extend(get_unprogrammed_posts_by_platform(platform))
-            else:
-                filtered_posts = unprogrammed_posts
+            # Filtrar según plataforma sobre los posts ya cargados (sin nuevas consultas)
+            pf_set = frozenset(platform_filter)
+            filtered_posts = [p for p in unprogrammed_posts if p['platform'] in pf_set] if pf_set else unprogrammed_posts
 
             # Mostrar publicaciones
             display_posts(filtered_posts, None, sort_by, 'saved')
@@ -154,8 +174,12 @@ with col_left:
         if not sent_posts:
             st.info("No hay publicaciones en el historial. Las publicaciones enviadas aparecerán aquí automáticamente.")
         else:
-            # Buscador por título
-            titles = [post['title'] for post in sent_posts if post['title']]
+            # Buscador por título (índice título -> posts construido una sola vez)
+            by_title = defaultdict(list)
+            for post in sent_posts:
+                if post['title']:
+                    by_title[post['title']].append(post)
+            titles = list(by_title)
             selected_title = st.selectbox(
                 "🔍 Buscar publicación por título",
                 options=[""] + titles,
@@ -164,7 +188,7 @@ with col_left:
 
             # Filtrar por título si se seleccionó uno
             if selected_title:
-                sent_posts = [post for post in sent_posts if post['title'] == selected_title]
+                sent_posts = by_title[selected_title]
 
             # Contenedor de filtros con estilo
             with st.container():
@@ -177,8 +201,8 @@ with col_left:
                 with col2:
                     date_range = st.date_input(
                         "Rango de fechas de envío",
-                        value=(datetime.now().date() - pd.Timedelta(days=30), datetime.now().date()),
-                        max_value=datetime.now().date(),
+                        value=(today - timedelta(days=30), today),
+                        max_value=today,
                         key="date_range_history",
                         disabled=not usar_filtro_fecha
                     )
@@ -186,39 +210,26 @@ with col_left:
                 with col3:
                     platform_filter = st.multiselect(
                         "Filtrar por plataforma",
-                        options=["LinkedIn", "Instagram", "WordPress", "Gmail", "WhatsApp"],
+                        options=PLATFORMS,
                         default=[],
                         key="platform_filter_history"
                     )
                 with col4:
                     sort_by = st.selectbox(
                         "Ordenar por",
-                        options=["Fecha de envío (reciente primero)", "Fecha de envío (antiguo primero)", "Plataforma"],
+                        options=SORT_HISTORY,
                         key="sort_by_history"
                     )
 
-            # Filtrar según plataforma
-            if platform_filter:
-                filtered_posts = []
-                for platform in platform_filter:
-                    filtered_posts.extend(get_sent_posts_by_platform(platform))
-            else:
-                filtered_posts = sent_posts
+            # Filtrar según plataforma sobre los posts ya cargados (sin nuevas consultas)
+            pf_set = frozenset(platform_filter)
+            filtered_posts = [p for p in sent_posts if p['platform'] in pf_set] if pf_set else sent_posts
 
             # Mostrar publicaciones
             display_posts(filtered_posts, date_range, sort_by, 'history', usar_filtro_fecha)
 
-with empty_col:
-    st.markdown("""
-        <div style="border-left: 2px solid #e6e6e6; height: 140vh; margin: 0 auto;"></div>
-    """, unsafe_allow_html=True)
-
 # Columna derecha: editor de publicación
-with col_right:
-    st.markdown("""
-    <div style="border-left: 2px solid #e6e6e6; height: 100%; position: absolute; left: 0; top: 0;"></div>
-    """, unsafe_allow_html=True)
-
+with col_right, st.container(key="editor_panel"):
     if st.session_state.selected_pub_id is not None:
         display_post_editor(st.session_state.selected_pub_id)
     else:
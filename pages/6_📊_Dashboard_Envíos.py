@@ -6,7 +6,9 @@ if not check_password():
     st.stop()
 
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from src.db_config import get_all_email_send_logs, get_email_send_results, get_email_send_stats, mark_email_as_bounced
 from src.graph_mail import fetch_ndr_bounces
 import plotly.express as px
@@ -14,12 +16,136 @@ import plotly.graph_objects as go
 
 st.set_page_config(layout="wide", page_title="Dashboard de Envíos", page_icon="📊")
 
+# Filas del historial que se envían al navegador por página
+LOGS_PAGE_SIZE = 50
+
+# Columnas de get_all_email_send_logs y tipos de los contadores
+LOG_COLUMNS = [
+    'id', 'post_id', 'platform', 'subject', 'total_recipients',
+    'successful_count', 'failed_count', 'started_at', 'completed_at'
+]
+LOG_COUNTER_DTYPES = {'total_recipients': 'int32', 'successful_count': 'int32', 'failed_count': 'int32'}
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_stats():
+    """Versión cacheada de get_email_send_stats para evitar consultas en cada rerun."""
+    return get_email_send_stats()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_logs_df():
+    """
+    Carga el historial de envíos como DataFrame normalizado (fechas parseadas y
+    tasa de éxito calculada) una sola vez por cambio en los datos.
+    """
+    logs = get_all_email_send_logs()
+    df = pd.DataFrame.from_records(logs, columns=LOG_COLUMNS)
+    if df.empty:
+        return df
+
+    df = df.astype(LOG_COUNTER_DTYPES)
+    # Columna de baja cardinalidad: categórica para ocupar menos y filtrar sobre códigos
+    df['platform'] = df['platform'].astype('category')
+
+    df['started_at'] = pd.to_datetime(df['started_at'])
+    df['completed_at'] = pd.to_datetime(df['completed_at'], errors='coerce')
+    df['success_rate'] = (df['successful_count'] / df['total_recipients'] * 100).round(2)
+    return df
+
+
+@st.cache_data(ttl=300)
+def _load_results(log_id):
+    """Resultados individuales de un envío como DataFrame, cacheados por ID."""
+    df = pd.DataFrame(get_email_send_results(log_id))
+    if not df.empty:
+        df['error_code'] = df['error_code'].astype('category')
+    return df
+
+
+def _load_dashboard_data():
+    """
+    Lanza en paralelo la carga de estadísticas y de historial (consultas independientes).
+    Devuelve los futures para que cada resultado se gestione con su propio manejo de errores.
+    """
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(max_workers=2, initializer=add_script_run_ctx, initargs=(None, ctx)) as executor:
+        return executor.submit(_load_stats), executor.submit(_load_logs_df)
+
+
+# Figuras con cache_resource: se devuelve el mismo objeto sin serializarlo ni copiarlo
+# en cada acierto (las figuras no se modifican tras crearlas)
+@st.cache_resource(max_entries=16)
+def _pie(successful, failed):
+    """Gráfico de pastel Exitosos vs Fallidos, reutilizado mientras no cambien los totales."""
+    fig = go.Figure(data=[go.Pie(
+        labels=['Exitosos', 'Fallidos'],
+        values=[successful, failed],
+        marker=dict(colors=['#00D26A', '#FF4B4B']),
+        hole=.4
+    )])
+    fig.update_layout(
+        title="Distribución de Resultados",
+        showlegend=True,
+        height=400
+    )
+    return fig
+
+
+@st.cache_resource(max_entries=16)
+def _gauge(success_rate):
+    """Indicador de tasa de éxito, reutilizado mientras no cambie la tasa."""
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=success_rate,
+        title={'text': "Tasa de Éxito (%)"},
+        delta={'reference': 100, 'increasing': {'color': "#00D26A"}},
+        gauge={
+            'axis': {'range': [None, 100]},
+            'bar': {'color': "#00D26A"},
+            'steps': [
+                {'range': [0, 50], 'color': "#FFE5E5"},
+                {'range': [50, 75], 'color': "#FFF4CC"},
+                {'range': [75, 100], 'color': "#E5F6E5"}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': 90
+            }
+        }
+    ))
+    fig.update_layout(height=400)
+    return fig
+
+
+@st.cache_resource(max_entries=16)
+def _error_bar(error_counts: pd.DataFrame):
+    """Gráfico de barras con la distribución de códigos de error (columnas error_code/count)."""
+    return px.bar(
+        error_counts,
+        x='error_code',
+        y='count',
+        labels={'error_code': 'Tipo de Error', 'count': 'Cantidad'},
+        title="Distribución de Tipos de Error"
+    )
+
+
+@st.cache_data
+def _csv(df: pd.DataFrame) -> bytes:
+    """Serializa un DataFrame a CSV (UTF-8) una sola vez por contenido distinto."""
+    return df.to_csv(index=False).encode('utf-8')
+
+
 st.title("📊 Dashboard de Envíos de Email")
 st.markdown("Visualiza estadísticas y resultados de tus operaciones de envío masivo de correos electrónicos.")
 
+# Cargar estadísticas e historial en paralelo
+f_stats, f_logs = _load_dashboard_data()
+
 # Obtener estadísticas generales
 try:
-    stats = get_email_send_stats()
+    stats = f_stats.result()
 except Exception as e:
     st.error(f"Error al cargar estadísticas: {e}")
     stats = {
@@ -109,6 +235,9 @@ if run_ndr:
         st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
 
         if updated_total > 0:
+            _load_stats.clear()
+            _load_logs_df.clear()
+            _load_results.clear()
             st.success(f"✅ {updated_total} registro(s) marcados como fallidos por rebote NDR. Recarga la página para ver las estadísticas actualizadas.")
         else:
             st.info("Los rebotes encontrados no coinciden con envíos registrados en el dashboard (puede que sean anteriores al período de logs).")
@@ -123,72 +252,33 @@ if stats['total_emails_attempted'] > 0:
 
     with col_graph1:
         # Gráfico de pastel: Exitosos vs Fallidos
-        fig_pie = go.Figure(data=[go.Pie(
-            labels=['Exitosos', 'Fallidos'],
-            values=[stats['total_successful'], stats['total_failed']],
-            marker=dict(colors=['#00D26A', '#FF4B4B']),
-            hole=.4
-        )])
-        fig_pie.update_layout(
-            title="Distribución de Resultados",
-            showlegend=True,
-            height=400
-        )
+        fig_pie = _pie(stats['total_successful'], stats['total_failed'])
         st.plotly_chart(fig_pie, use_container_width=True)
 
     with col_graph2:
         # Gráfico de gauge: Tasa de éxito
-        fig_gauge = go.Figure(go.Indicator(
-            mode="gauge+number+delta",
-            value=stats['success_rate'],
-            title={'text': "Tasa de Éxito (%)"},
-            delta={'reference': 100, 'increasing': {'color': "#00D26A"}},
-            gauge={
-                'axis': {'range': [None, 100]},
-                'bar': {'color': "#00D26A"},
-                'steps': [
-                    {'range': [0, 50], 'color': "#FFE5E5"},
-                    {'range': [50, 75], 'color': "#FFF4CC"},
-                    {'range': [75, 100], 'color': "#E5F6E5"}
-                ],
-                'threshold': {
-                    'line': {'color': "red", 'width': 4},
-                    'thickness': 0.75,
-                    'value': 90
-                }
-            }
-        ))
-        fig_gauge.update_layout(height=400)
+        fig_gauge = _gauge(stats['success_rate'])
         st.plotly_chart(fig_gauge, use_container_width=True)
 
 # ==================== SECCIÓN 3: HISTORIAL DE ENVÍOS ====================
 st.header("📜 Historial de Envíos")
 
 try:
-    logs = get_all_email_send_logs()
+    df_logs = f_logs.result()
 except Exception as e:
     st.error(f"Error al cargar historial: {e}")
-    logs = []
-
-if logs:
-    # Crear DataFrame para mostrar
-    df_logs = pd.DataFrame(logs)
-
-    # Formatear fechas
-    df_logs['started_at'] = pd.to_datetime(df_logs['started_at']).dt.strftime('%Y-%m-%d %H:%M:%S')
-    df_logs['completed_at'] = pd.to_datetime(df_logs['completed_at'], errors='coerce').dt.strftime('%Y-%m-%d %H:%M:%S')
-
-    # Calcular tasa de éxito por operación
-    df_logs['success_rate'] = (df_logs['successful_count'] / df_logs['total_recipients'] * 100).round(2)
+    df_logs = pd.DataFrame()
 
+if not df_logs.empty:
     # Filtros
     col_filter1, col_filter2 = st.columns(2)
 
     with col_filter1:
+        platforms = df_logs['platform'].unique().tolist()
         filter_platform = st.multiselect(
             "Filtrar por plataforma",
-            options=df_logs['platform'].unique(),
-            default=df_logs['platform'].unique()
+            options=platforms,
+            default=platforms
         )
 
     with col_filter2:
@@ -201,11 +291,21 @@ if logs:
     # Aplicar filtros
     df_filtered = df_logs[df_logs['platform'].isin(filter_platform)]
     if filter_date:
-        df_filtered = df_filtered[pd.to_datetime(df_filtered['started_at']) >= pd.to_datetime(filter_date)]
+        df_filtered = df_filtered[df_filtered['started_at'] >= pd.Timestamp(filter_date)]
+
+    # Paginar en el servidor: solo se envía al navegador la página actual
+    total_pages = max(1, (len(df_filtered) - 1) // LOGS_PAGE_SIZE + 1)
+    page = 1
+    if total_pages > 1:
+        page = st.number_input(f"Página (de {total_pages})", min_value=1, max_value=total_pages, value=1, step=1)
+    df_page = df_filtered.iloc[(page - 1) * LOGS_PAGE_SIZE: page * LOGS_PAGE_SIZE]
+
+    # Formatear fechas solo en la copia que se muestra
+    df_display = df_page.assign(started_at=df_page['started_at'].dt.strftime('%Y-%m-%d %H:%M:%S'))
 
     # Mostrar tabla resumen
     st.dataframe(
-        df_filtered[[
+        df_display[[
             'id', 'platform', 'subject', 'started_at', 'total_recipients',
             'successful_count', 'failed_count', 'success_rate'
         ]].rename(columns={
@@ -225,15 +325,19 @@ if logs:
     # ==================== SECCIÓN 4: DETALLES DE UN ENVÍO ====================
     st.header("🔍 Detalles de Envío")
 
+    # Índice por ID construido una sola vez (evita recorrer el DataFrame por cada opción)
+    df_by_id = df_filtered.set_index('id', drop=False)
+    id_to_subject = dict(zip(df_filtered['id'], df_filtered['subject'].fillna('')))
+
     selected_log_id = st.selectbox(
         "Selecciona un envío para ver detalles:",
         options=df_filtered['id'].tolist(),
-        format_func=lambda x: f"ID {x} - {df_filtered[df_filtered['id']==x]['subject'].values[0][:50]}..."
+        format_func=lambda x: f"ID {x} - {id_to_subject[x][:50]}..."
     )
 
     if selected_log_id:
         # Obtener información del log seleccionado
-        selected_log = df_filtered[df_filtered['id'] == selected_log_id].iloc[0]
+        selected_log = df_by_id.loc[selected_log_id]
 
         # Mostrar métricas del envío seleccionado
         col_detail1, col_detail2, col_detail3, col_detail4 = st.columns(4)
@@ -252,19 +356,22 @@ if logs:
 
         # Obtener resultados individuales
         try:
-            results = get_email_send_results(selected_log_id)
+            df_results = _load_results(selected_log_id)
 
-            if results:
+            if not df_results.empty:
                 st.subheader("📋 Resultados Individuales")
 
+                # Separar exitosos y fallidos con una sola máscara vectorizada
+                mask = df_results['success'].astype(bool)
+                df_success = df_results.loc[mask]
+                df_failed = df_results.loc[~mask]
+
                 # Crear pestañas para exitosos y fallidos
                 tab_success, tab_failed = st.tabs(["✅ Exitosos", "❌ Fallidos"])
 
                 with tab_success:
-                    successful_results = [r for r in results if r['success']]
-                    if successful_results:
-                        st.write(f"**{len(successful_results)} emails enviados exitosamente:**")
-                        df_success = pd.DataFrame(successful_results)
+                    if not df_success.empty:
+                        st.write(f"**{len(df_success)} emails enviados exitosamente:**")
                         st.dataframe(
                             df_success[['recipient_email', 'sent_at']].rename(columns={
                                 'recipient_email': 'Email',
@@ -275,7 +382,7 @@ if logs:
                         )
 
                         # Botón para exportar exitosos
-                        csv_success = df_success['recipient_email'].to_csv(index=False, header=['email'])
+                        csv_success = _csv(df_success[['recipient_email']].rename(columns={'recipient_email': 'email'}))
                         st.download_button(
                             label="📥 Descargar lista de exitosos (CSV)",
                             data=csv_success,
@@ -286,10 +393,8 @@ if logs:
                         st.info("No hay emails exitosos en este envío.")
 
                 with tab_failed:
-                    failed_results = [r for r in results if not r['success']]
-                    if failed_results:
-                        st.write(f"**{len(failed_results)} emails fallidos:**")
-                        df_failed = pd.DataFrame(failed_results)
+                    if not df_failed.empty:
+                        st.write(f"**{len(df_failed)} emails fallidos:**")
                         st.dataframe(
                             df_failed[['recipient_email', 'error_code', 'error_message', 'sent_at']].rename(columns={
                                 'recipient_email': 'Email',
@@ -303,18 +408,13 @@ if logs:
 
                         # Análisis de errores
                         st.subheader("📈 Análisis de Errores")
-                        error_counts = df_failed['error_code'].value_counts()
+                        error_counts = df_failed['error_code'].value_counts().rename_axis('error_code').reset_index(name='count')
 
-                        fig_errors = px.bar(
-                            x=error_counts.index,
-                            y=error_counts.values,
-                            labels={'x': 'Tipo de Error', 'y': 'Cantidad'},
-                            title="Distribución de Tipos de Error"
-                        )
+                        fig_errors = _error_bar(error_counts)
                         st.plotly_chart(fig_errors, use_container_width=True)
 
                         # Botón para exportar fallidos
-                        csv_failed = df_failed[['recipient_email', 'error_code', 'error_message']].to_csv(index=False)
+                        csv_failed = _csv(df_failed[['recipient_email', 'error_code', 'error_message']])
                         st.download_button(
                             label="📥 Descargar lista de fallidos (CSV)",
                             data=csv_failed,
@@ -338,8 +438,9 @@ st.header("📥 Exportar Datos")
 col_export1, col_export2 = st.columns(2)
 
 with col_export1:
-    if logs:
-        csv_all = pd.DataFrame(logs).to_csv(index=False)
+    if not df_logs.empty:
+        # Solo las columnas originales del historial (sin columnas derivadas)
+        csv_all = _csv(df_logs[LOG_COLUMNS])
         st.download_button(
             label="📊 Descargar todo el historial (CSV)",
             data=csv_all,
@@ -1,26 +1,17 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from src.linkedin import LinkedInClient
 from src.ui_components import render_header
 from src.auth import check_password
 
-# --- Page config ---
-st.set_page_config(
-    page_title="LinkedIn Analytics",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-render_header()
-
-if not check_password():
-    st.stop()
-
 # --- Clean SaaS CSS ---
-st.markdown("""
+_CSS = """
 <style>
     /* Base reset */
     .block-container { padding-top: 2rem; }
@@ -127,7 +118,41 @@ st.markdown("""
     .stMarkdown p, .stMarkdown li { color: #d1d5db; }
     .stMarkdown strong { color: #f3f4f6; }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# --- Page config ---
+st.set_page_config(
+    page_title="LinkedIn Analytics",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+render_header()
+
+if not check_password():
+    st.stop()
+
+# Emitted on every run: Streamlit drops elements not rendered in the current run
+st.markdown(_CSS, unsafe_allow_html=True)
+
+# --- Sidebar options ---
+DATE_PRESETS = ("7 dias", "30 dias", "90 dias", "Personalizado")
+DAYS_MAP = {"7 dias": 7, "30 dias": 30, "90 dias": 90}
+CONTENT_TYPES = ("Texto", "Imagen/Video", "Carrusel", "Articulo", "Encuesta")
+DEFAULT_CONTENT_TYPES = ("Texto", "Imagen/Video", "Carrusel")
+SORT_ORDERS = ("Descendente", "Ascendente")
+
+# --- Metric columns ---
+# Alternative metric names returned by some LinkedIn endpoints -> canonical names
+CANONICAL = {
+    'impression': 'impresiones',
+    'reaction': 'likes',
+    'comment': 'comentarios',
+    'reshare': 'compartidos',
+    'click_count': 'clics',
+}
+METRIC_COLUMNS = ['impresiones', 'clics', 'likes', 'comentarios', 'compartidos']
+KPI_COLUMNS = METRIC_COLUMNS + ['ER%']
 
 # --- Plotly theme ---
 CHART_COLORS = ["#3b82f6", "#10b981", "#f59e0b", "#f43f5e", "#8b5cf6", "#06b6d4"]
@@ -139,6 +164,9 @@ CHART_LAYOUT = dict(
     xaxis=dict(showgrid=False, zeroline=False, color="#9ca3af"),
     yaxis=dict(showgrid=True, gridcolor="rgba(255,255,255,0.06)", zeroline=False, color="#9ca3af"),
 )
+# Pie charts have no axes or plot area: only the shared background, font and margins apply
+PIE_LAYOUT = {k: CHART_LAYOUT[k] for k in ('paper_bgcolor', 'font', 'margin')}
+TITLE_FONT = dict(size=14, color="#e5e7eb")
 
 
 def metric_card(label, value, sub="", dot_color="blue"):
@@ -162,6 +190,113 @@ except Exception as e:
     st.error(f"Error al conectar con LinkedIn: {e}")
     st.stop()
 
+
+# --- Cached LinkedIn fetchers ---
+# Los DataFrames se guardan con cache_resource (sin hash ni serializacion del
+# resultado) y cada lectura trabaja sobre una copia para no mutar el cacheado.
+@st.cache_resource(ttl=600, show_spinner=False)
+def _raw_post_metrics(post_ids):
+    return get_linkedin_client().get_post_metrics(list(post_ids))
+
+
+@st.cache_resource(ttl=600, show_spinner=False)
+def _raw_follower_segmentation(pivot_type):
+    return get_linkedin_client().get_follower_segmentation(pivot_type)
+
+
+@st.cache_resource(ttl=600, show_spinner=False)
+def _raw_follower_growth(days):
+    return get_linkedin_client().get_follower_growth(days=days)
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def cached_recent_posts(count):
+    return get_linkedin_client().get_recent_posts_details(count=count)
+
+
+def _copy_df(df):
+    return df.copy() if df is not None else None
+
+
+def fetch_follower_segmentation(pivot_type):
+    return _copy_df(_raw_follower_segmentation(pivot_type))
+
+
+def fetch_follower_growth(days):
+    return _copy_df(_raw_follower_growth(days))
+
+
+SEGMENTATION_PIVOTS = ('GEOGRAPHIC_AREA', 'SENIORITY', 'INDUSTRY', 'COMPANY_SIZE')
+
+
+def load_audience(days):
+    """Follower segmentations and growth, fetched concurrently (independent API calls)."""
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(max_workers=len(SEGMENTATION_PIVOTS) + 1,
+                            initializer=add_script_run_ctx, initargs=(None, ctx)) as executor:
+        futures = {pivot: executor.submit(fetch_follower_segmentation, pivot) for pivot in SEGMENTATION_PIVOTS}
+        futures['growth'] = executor.submit(fetch_follower_growth, days)
+    return {key: future.result() for key, future in futures.items()}
+
+
+# load_overview outcomes, so the Overview tab can tell "no posts" from "no metrics"
+OVERVIEW_OK = "ok"
+OVERVIEW_NO_POSTS = "no_posts"
+OVERVIEW_NO_METRICS = "no_metrics"
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def load_overview(num_posts, content_filter):
+    """
+    Recent posts merged with their metrics and filtered by content type.
+    Returns (status, df, debug); df is empty unless status is OVERVIEW_OK, and
+    an empty df with OVERVIEW_OK means the filters matched nothing.
+    """
+    posts_data = cached_recent_posts(num_posts)
+    if not posts_data:
+        return OVERVIEW_NO_POSTS, pd.DataFrame(), {}
+
+    post_ids = [p['post_id'] for p in posts_data]
+    # Read-only use of the cached frame (join/set_index build new frames): no copy needed
+    df_metrics = _raw_post_metrics(tuple(post_ids))
+    if df_metrics is None or df_metrics.empty:
+        debug = {
+            'posts': len(posts_data),
+            'sample_ids': post_ids[:3],
+            'metrics_type': str(type(df_metrics)),
+            'shape': df_metrics.shape if df_metrics is not None else None,
+        }
+        return OVERVIEW_NO_METRICS, pd.DataFrame(), debug
+
+    # Index-aligned join; post_id is unique on both sides, which validate enforces
+    df_posts = pd.DataFrame(posts_data).set_index('post_id')
+    df_final = df_posts.join(df_metrics.set_index('post_id'), how='left', validate='one_to_one').reset_index()
+    df_final = df_final.rename(columns=CANONICAL)
+
+    if content_filter:
+        df_final = df_final[df_final['tipo'].isin(content_filter)]
+
+    # Small non-negative counters and a bounded percentage: narrow dtypes keep the cached copy small
+    narrowed = {col: pd.to_numeric(df_final[col], downcast='unsigned') for col in METRIC_COLUMNS}
+    narrowed['ER%'] = df_final['ER%'].astype(np.float32)
+
+    # Low-cardinality label: dictionary-encoded
+    return OVERVIEW_OK, df_final.assign(**narrowed).astype({'tipo': 'category'}), {}
+
+
+@st.cache_data(show_spinner=False)
+def to_csv_bytes(df, cols):
+    """CSV export of the given columns, serialized once per distinct content."""
+    return df[list(cols)].to_csv(index=False).encode('utf-8')
+
+
+# Fetchers invalidated by the "Actualizar datos" button
+REFRESHABLE = [
+    cached_recent_posts, _raw_post_metrics, _raw_follower_segmentation,
+    _raw_follower_growth, load_overview,
+]
+
+
 # --- Header ---
 st.title("LinkedIn Analytics")
 st.markdown('<p class="page-subtitle">Rendimiento de publicaciones y audiencia</p>', unsafe_allow_html=True)
@@ -174,7 +309,7 @@ with st.sidebar:
 
     date_preset = st.selectbox(
         "Periodo",
-        ["7 dias", "30 dias", "90 dias", "Personalizado"],
+        DATE_PRESETS,
         index=1
     )
 
@@ -185,8 +320,7 @@ with st.sidebar:
         with col2:
             end_date = st.date_input("Hasta", datetime.now())
     else:
-        days_map = {"7 dias": 7, "30 dias": 30, "90 dias": 90}
-        days = days_map[date_preset]
+        days = DAYS_MAP[date_preset]
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
 
@@ -196,8 +330,8 @@ with st.sidebar:
 
     content_filter = st.multiselect(
         "Tipo de contenido",
-        ["Texto", "Imagen/Video", "Carrusel", "Articulo", "Encuesta"],
-        default=["Texto", "Imagen/Video", "Carrusel"]
+        CONTENT_TYPES,
+        default=DEFAULT_CONTENT_TYPES
     )
 
     st.divider()
@@ -207,8 +341,8 @@ with st.sidebar:
     st.divider()
 
     if st.button("Actualizar datos", type="primary", use_container_width=True):
-        st.session_state['refresh_data'] = True
-        st.cache_data.clear()
+        for fetcher in REFRESHABLE:
+            fetcher.clear()
         st.rerun()
 
 # ==============================================================================
@@ -226,62 +360,54 @@ tab_overview, tab_content, tab_audience, tab_comparison = st.tabs([
 # ==============================================================================
 with tab_overview:
 
-    # Load data
-    if 'linkedin_data_pro' not in st.session_state or st.session_state.get('refresh_data', False):
-        with st.spinner("Cargando datos de LinkedIn..."):
-            try:
-                posts_data = api.get_recent_posts_details(count=num_posts)
-
-                if posts_data:
-                    post_ids = [p['post_id'] for p in posts_data]
-                    df_metrics = api.get_post_metrics(post_ids)
-
-                    if df_metrics is not None and not df_metrics.empty:
-                        df_posts = pd.DataFrame(posts_data)
-                        df_final = pd.merge(df_posts, df_metrics, on='post_id', how='left')
-
-                        if content_filter:
-                            df_final = df_final[df_final['tipo'].isin(content_filter)]
-
-                        if not df_final.empty:
-                            st.session_state['linkedin_data_pro'] = df_final
-                            st.session_state['refresh_data'] = False
-                        else:
-                            st.warning("No hay posts que coincidan con los filtros seleccionados.")
-                            st.stop()
-                    else:
-                        st.error("No se pudieron obtener metricas de la API de LinkedIn.")
-                        with st.expander("Debug"):
-                            st.write(f"Posts encontrados: {len(posts_data)}")
-                            for i, pid in enumerate(post_ids[:3]):
-                                st.code(pid)
-                            st.write(f"Tipo respuesta: {type(df_metrics)}")
-                            if df_metrics is not None:
-                                st.write(f"Shape: {df_metrics.shape}")
-                        st.stop()
-                else:
-                    st.warning("No se encontraron publicaciones en tu cuenta de LinkedIn.")
-                    st.stop()
-
-            except Exception as e:
-                st.error(f"Error al cargar datos: {e}")
-                with st.expander("Detalles"):
-                    import traceback
-                    st.code(traceback.format_exc())
+    # Load data (cached: the API is only hit after a refresh or when the TTL expires)
+    df = None
+    er_max = 10.0
+    with st.spinner("Cargando datos de LinkedIn..."):
+        try:
+            status, df, debug = load_overview(num_posts, tuple(content_filter))
+
+            if status == OVERVIEW_NO_POSTS:
+                st.warning("No se encontraron publicaciones en tu cuenta de LinkedIn.")
+                st.stop()
+            elif status == OVERVIEW_NO_METRICS:
+                st.error("No se pudieron obtener metricas de la API de LinkedIn.")
+                with st.expander("Debug"):
+                    st.write(f"Posts encontrados: {debug['posts']}")
+                    for pid in debug['sample_ids']:
+                        st.code(pid)
+                    st.write(f"Tipo respuesta: {debug['metrics_type']}")
+                    if debug['shape'] is not None:
+                        st.write(f"Shape: {debug['shape']}")
+                st.stop()
+            elif df.empty:
+                st.warning("No hay posts que coincidan con los filtros seleccionados.")
                 st.stop()
 
-    df = st.session_state.get('linkedin_data_pro')
+        except Exception as e:
+            st.error(f"Error al cargar datos: {e}")
+            with st.expander("Detalles"):
+                import traceback
+                st.code(traceback.format_exc())
+            st.stop()
+
 
     if df is not None and not df.empty:
 
         # --- KPI Cards ---
-        total_impressions = df['impresiones'].sum() if 'impresiones' in df.columns else df.get('impression', pd.Series([0])).sum()
-        total_clicks = df.get('clics', pd.Series([0])).sum()
-        total_likes = df.get('likes', pd.Series([0])).sum()
-        total_comments = df.get('comentarios', pd.Series([0])).sum()
-        total_shares = df.get('compartidos', pd.Series([0])).sum()
+        # One pass over a single block for the five totals plus the ER% mean
+        kpi = df[KPI_COLUMNS].to_numpy(dtype=np.float64)
+        totals = pd.Series(np.nansum(kpi[:, :-1], axis=0), index=METRIC_COLUMNS)
+        total_impressions = totals['impresiones']
+        total_clicks = totals['clics']
+        total_likes = totals['likes']
+        total_comments = totals['comentarios']
+        total_shares = totals['compartidos']
         total_engagement = total_likes + total_comments + total_shares + total_clicks
-        avg_er = df['ER%'].mean()
+        avg_er = float(np.nanmean(kpi[:, -1]))
+        # Upper bound for the ER% progress columns (also used by the Content tab)
+        er_max = float(df['ER%'].max())
+        er_max = er_max if er_max > 0 else 10.0
 
         kpi_cols = st.columns(4, gap="medium")
 
@@ -304,21 +430,24 @@ with tab_overview:
 
         with col1:
             if 'fecha' in df.columns and not df['fecha'].isna().all():
-                df_temp = df.copy()
-                df_temp['fecha_dt'] = pd.to_datetime(df_temp['fecha'], errors='coerce')
-                df_sorted = df_temp.dropna(subset=['fecha_dt']).sort_values('fecha_dt')
-
-                if not df_sorted.empty:
-                    imp_col = 'impresiones' if 'impresiones' in df_sorted.columns else 'impression'
+                # Sort positions by date instead of copying the frame to add a column
+                dt = pd.to_datetime(df['fecha'], errors='coerce')
+                mask = dt.notna().to_numpy()
+                order = np.argsort(dt.to_numpy()[mask], kind='stable')
+
+                if order.size:
+                    imp_col = 'impresiones'
+                    x_fecha = df['fecha'].to_numpy()[mask][order]
+                    y_imp = df[imp_col].to_numpy()[mask][order]
                     fig_bars = go.Figure(go.Bar(
-                        x=df_sorted['fecha'],
-                        y=df_sorted[imp_col],
+                        x=x_fecha,
+                        y=y_imp,
                         marker_color="#3b82f6",
-                                            ))
+                    ))
                     fig_bars.update_layout(
                         **CHART_LAYOUT,
                         height=320,
-                        title=dict(text="Impresiones por post", font=dict(size=14, color="#e5e7eb")),
+                        title=dict(text="Impresiones por post", font=TITLE_FONT),
                         yaxis_title="",
                         xaxis_title="",
                     )
@@ -327,28 +456,19 @@ with tab_overview:
                 st.info("No hay datos de fecha disponibles")
 
         with col2:
-            engagement_data = pd.DataFrame({
-                'Tipo': ['Likes', 'Comentarios', 'Compartidos', 'Clics'],
-                'Cantidad': [
-                    df.get('likes', df.get('reaction', pd.Series([0]))).sum(),
-                    df.get('comentarios', df.get('comment', pd.Series([0]))).sum(),
-                    df.get('compartidos', df.get('reshare', pd.Series([0]))).sum(),
-                    df.get('clics', df.get('click_count', pd.Series([0]))).sum()
-                ]
-            })
-
+            engagement_counts = totals[['likes', 'comentarios', 'compartidos', 'clics']].to_numpy(dtype=np.int64)
             fig_engagement = go.Figure(go.Bar(
-                x=engagement_data['Tipo'],
-                y=engagement_data['Cantidad'],
+                x=['Likes', 'Comentarios', 'Compartidos', 'Clics'],
+                y=engagement_counts,
                 marker_color=CHART_COLORS[:4],
-                                text=engagement_data['Cantidad'],
+                text=engagement_counts,
                 textposition='outside',
                 texttemplate='%{text:,.0f}',
             ))
             fig_engagement.update_layout(
                 **CHART_LAYOUT,
                 height=320,
-                title=dict(text="Distribucion de engagement", font=dict(size=14, color="#e5e7eb")),
+                title=dict(text="Distribucion de engagement", font=TITLE_FONT),
                 yaxis_title="",
                 xaxis_title="",
                 showlegend=False,
@@ -358,7 +478,7 @@ with tab_overview:
         # --- Top Posts ---
         st.markdown('<div class="section-title">Top 5 publicaciones por engagement</div>', unsafe_allow_html=True)
 
-        top_posts = df.nlargest(5, 'ER%')[['texto_corto', 'impresiones', 'likes', 'comentarios', 'ER%']].copy()
+        top_posts = df[['texto_corto', 'impresiones', 'likes', 'comentarios', 'ER%']].nlargest(5, 'ER%')
         top_posts.columns = ['Contenido', 'Impresiones', 'Likes', 'Comentarios', 'ER%']
 
         st.dataframe(
@@ -374,7 +494,7 @@ with tab_overview:
                     "Engagement %",
                     format="%.2f%%",
                     min_value=0,
-                    max_value=float(df['ER%'].max()) if df['ER%'].max() > 0 else 10
+                    max_value=er_max
                 )
             },
             height=250
@@ -384,7 +504,7 @@ with tab_overview:
         st.markdown('<div class="section-title">Resumen de metricas</div>', unsafe_allow_html=True)
 
         sec_cols = st.columns(4, gap="medium")
-        avg_impressions = df.get('impresiones', df.get('impression', pd.Series([0]))).mean()
+        avg_impressions = df['impresiones'].mean()
 
         with sec_cols[0]:
             st.metric("Reacciones totales", f"{total_likes:,.0f}")
@@ -395,10 +515,22 @@ with tab_overview:
         with sec_cols[3]:
             st.metric("Impresiones promedio", f"{avg_impressions:,.0f}")
 
+# Per-type aggregates, computed once and shared by the Content and Comparison tabs
+tipo_stats = None
+if df is not None and not df.empty and 'tipo' in df.columns:
+    tipo_stats = df.groupby('tipo', observed=True, sort=False).agg(
+        n=('post_id', 'count'),
+        imp_sum=('impresiones', 'sum'),
+        imp_mean=('impresiones', 'mean'),
+        er_mean=('ER%', 'mean'),
+    )
+
 # ==============================================================================
 # TAB 2: CONTENT ANALYSIS
 # ==============================================================================
-with tab_content:
+@st.fragment
+def render_content_tab(df, tipo_stats, er_max):
+    """Content tab; its sort/detail widgets rerun only this fragment."""
     st.markdown('<div class="section-title">Analisis de contenido</div>', unsafe_allow_html=True)
 
     if df is not None and not df.empty:
@@ -409,7 +541,7 @@ with tab_content:
             sort_metric = st.selectbox("Ordenar por", available_metrics, index=0 if "ER%" in available_metrics else 0)
 
         with col_f2:
-            sort_order = st.radio("Orden", ["Descendente", "Ascendente"], horizontal=True)
+            sort_order = st.radio("Orden", SORT_ORDERS, horizontal=True)
 
         with col_f3:
             show_details = st.checkbox("Mostrar detalles completos", value=False)
@@ -417,15 +549,14 @@ with tab_content:
         # Performance by content type
         st.markdown('<div class="section-title">Rendimiento por tipo</div>', unsafe_allow_html=True)
 
-        if 'tipo' in df.columns:
-            content_analysis = df.groupby('tipo').agg({
-                'impresiones': 'sum' if 'impresiones' in df.columns else lambda x: df.get('impression', 0).sum(),
-                'ER%': 'mean',
-                'post_id': 'count'
-            }).reset_index()
+        if tipo_stats is not None:
+            content_analysis = tipo_stats[['imp_sum', 'er_mean', 'n']].reset_index()
 
             content_analysis.columns = ['Tipo', 'Impresiones Totales', 'ER% Promedio', 'Cantidad']
             content_analysis = content_analysis.sort_values('ER% Promedio', ascending=False)
+            # Sorted descending, so the bound is the first row; same fallback as er_max
+            er_type_max = float(content_analysis['ER% Promedio'].iat[0]) if not content_analysis.empty else 0.0
+            er_type_max = er_type_max if er_type_max > 0 else 10.0
 
             st.dataframe(
                 content_analysis,
@@ -439,7 +570,7 @@ with tab_content:
                         "Engagement %",
                         format="%.2f%%",
                         min_value=0,
-                        max_value=float(content_analysis['ER% Promedio'].max()) if not content_analysis.empty else 10
+                        max_value=er_type_max
                     )
                 }
             )
@@ -447,14 +578,19 @@ with tab_content:
         # Detailed table
         st.markdown('<div class="section-title">Detalle de publicaciones</div>', unsafe_allow_html=True)
 
-        df_sorted = df.sort_values(by=sort_metric, ascending=(sort_order == "Ascendente"))
-
         if show_details:
             cols_display = ['fecha', 'texto_completo', 'tipo', 'impresiones', 'ER%', 'likes', 'comentarios', 'compartidos', 'clics']
         else:
             cols_display = ['fecha', 'texto_corto', 'tipo', 'impresiones', 'ER%', 'likes', 'comentarios']
 
-        cols_display = [col for col in cols_display if col in df_sorted.columns]
+        cols_display = [col for col in cols_display if col in df.columns]
+
+        # Order positions on the sort key alone, then take only the rendered columns.
+        # Negating the keys keeps the descending order stable with NaN last, as sort_values does.
+        sort_keys = df[sort_metric].to_numpy(dtype=np.float64)
+        if sort_order != "Ascendente":
+            sort_keys = -sort_keys
+        df_sorted = df[cols_display].take(np.argsort(sort_keys, kind='stable'))
 
         st.dataframe(
             df_sorted[cols_display],
@@ -469,7 +605,7 @@ with tab_content:
                     "Engagement %",
                     format="%.2f%%",
                     min_value=0,
-                    max_value=float(df['ER%'].max()) if df['ER%'].max() > 0 else 10
+                    max_value=er_max
                 ),
                 "likes": st.column_config.NumberColumn("Likes", format="%d"),
                 "comentarios": st.column_config.NumberColumn("Comentarios", format="%d")
@@ -477,7 +613,7 @@ with tab_content:
             height=400
         )
 
-        csv = df_sorted[cols_display].to_csv(index=False)
+        csv = to_csv_bytes(df_sorted, tuple(cols_display))
         st.download_button(
             label="Descargar CSV",
             data=csv,
@@ -485,10 +621,16 @@ with tab_content:
             mime="text/csv"
         )
 
+
+with tab_content:
+    render_content_tab(df, tipo_stats, er_max)
+
 # ==============================================================================
 # TAB 3: AUDIENCE
 # ==============================================================================
-with tab_audience:
+@st.fragment
+def render_audience_tab(days):
+    """Audience tab; the load button reruns only this fragment."""
     st.markdown('<div class="section-title">Audiencia</div>', unsafe_allow_html=True)
 
     col_aud1, col_aud2 = st.columns([3, 1])
@@ -499,6 +641,7 @@ with tab_audience:
 
     if st.session_state.get('audience_loaded', False):
         with st.spinner("Analizando audiencia..."):
+            audience = load_audience(days)
 
             st.markdown('<div class="section-title">Segmentacion demografica</div>', unsafe_allow_html=True)
 
@@ -506,17 +649,18 @@ with tab_audience:
 
             with seg_col1:
                 st.markdown("**Ubicacion geografica (Top 10)**")
-                df_geo = api.get_follower_segmentation("GEOGRAPHIC_AREA")
+                df_geo = audience['GEOGRAPHIC_AREA']
 
                 if df_geo is not None and not df_geo.empty:
                     df_geo_top = df_geo.head(10).sort_values('seguidores', ascending=True)
 
+                    geo_counts = df_geo_top['seguidores'].to_numpy()
                     fig_geo = go.Figure(go.Bar(
-                        y=df_geo_top['segmento'],
-                        x=df_geo_top['seguidores'],
+                        y=df_geo_top['segmento'].to_numpy(),
+                        x=geo_counts,
                         orientation='h',
                         marker_color="#3b82f6",
-                                                text=df_geo_top['seguidores'],
+                        text=geo_counts,
                         texttemplate='%{text:,.0f}',
                         textposition='outside',
                     ))
@@ -532,7 +676,7 @@ with tab_audience:
 
             with seg_col2:
                 st.markdown("**Nivel de experiencia**")
-                df_seniority = api.get_follower_segmentation("SENIORITY")
+                df_seniority = audience['SENIORITY']
 
                 if df_seniority is not None and not df_seniority.empty:
                     fig_sen = go.Figure(go.Pie(
@@ -544,11 +688,9 @@ with tab_audience:
                         textinfo='percent+label',
                     ))
                     fig_sen.update_layout(
-                        paper_bgcolor="rgba(0,0,0,0)",
-                        font=dict(family="Inter, system-ui, sans-serif", color="#d1d5db", size=12),
+                        **PIE_LAYOUT,
                         height=400,
                         showlegend=False,
-                        margin=dict(l=16, r=16, t=24, b=16),
                     )
                     st.plotly_chart(fig_sen, use_container_width=True)
                 else:
@@ -560,7 +702,7 @@ with tab_audience:
 
             with ind_col1:
                 st.markdown("**Top 10 sectores industriales**")
-                df_ind = api.get_follower_segmentation("INDUSTRY")
+                df_ind = audience['INDUSTRY']
 
                 if df_ind is not None and not df_ind.empty:
                     df_ind_top = df_ind.head(10)
@@ -583,7 +725,7 @@ with tab_audience:
 
             with ind_col2:
                 st.markdown("**Tamano de empresa**")
-                df_size = api.get_follower_segmentation("COMPANY_SIZE")
+                df_size = audience['COMPANY_SIZE']
 
                 if df_size is not None and not df_size.empty:
                     fig_size = go.Figure(go.Bar(
@@ -604,7 +746,7 @@ with tab_audience:
             # Follower growth
             st.markdown('<div class="section-title">Crecimiento de seguidores</div>', unsafe_allow_html=True)
 
-            df_growth = api.get_follower_growth(days=int((end_date - start_date).days))
+            df_growth = audience['growth']
 
             if df_growth is not None and not df_growth.empty:
                 fig_growth = go.Figure(go.Bar(
@@ -615,7 +757,7 @@ with tab_audience:
                 fig_growth.update_layout(
                     **CHART_LAYOUT,
                     height=320,
-                    title=dict(text="Nuevos seguidores por dia", font=dict(size=14, color="#e5e7eb")),
+                    title=dict(text="Nuevos seguidores por dia", font=TITLE_FONT),
                     yaxis_title="",
                     xaxis_title="",
                 )
@@ -635,6 +777,10 @@ with tab_audience:
             else:
                 st.info("No hay datos de crecimiento disponibles")
 
+
+with tab_audience:
+    render_audience_tab(int((end_date - start_date).days))
+
 # ==============================================================================
 # TAB 4: COMPARISON
 # ==============================================================================
@@ -654,11 +800,11 @@ with tab_comparison:
             ],
             'Valor': [
                 len(df),
-                f"{df.get('impresiones', df.get('impression', pd.Series([0]))).sum():,.0f}",
-                f"{df.get('clics', pd.Series([0])).sum():,.0f}",
-                f"{df.get('likes', pd.Series([0])).sum():,.0f}",
-                f"{df.get('comentarios', pd.Series([0])).sum():,.0f}",
-                f"{df.get('compartidos', pd.Series([0])).sum():,.0f}",
+                f"{totals['impresiones']:,.0f}",
+                f"{totals['clics']:,.0f}",
+                f"{totals['likes']:,.0f}",
+                f"{totals['comentarios']:,.0f}",
+                f"{totals['compartidos']:,.0f}",
                 f"{df['ER%'].mean():.2f}%"
             ]
         }
@@ -677,12 +823,8 @@ with tab_comparison:
 
         st.markdown('<div class="section-title">Rendimiento por tipo de contenido</div>', unsafe_allow_html=True)
 
-        if 'tipo' in df.columns:
-            tipo_summary = df.groupby('tipo').agg({
-                'post_id': 'count',
-                'impresiones': 'mean',
-                'ER%': 'mean'
-            }).round(2)
+        if tipo_stats is not None:
+            tipo_summary = tipo_stats[['n', 'imp_mean', 'er_mean']].round(2)
 
             tipo_summary.columns = ['Cantidad', 'Impresiones Promedio', 'ER% Promedio']
             tipo_summary = tipo_summary.sort_values('ER% Promedio', ascending=False)
@@ -697,18 +839,19 @@ with tab_comparison:
                 }
             )
 
+            tipo_er = tipo_summary['ER% Promedio'].to_numpy()
             fig_tipo = go.Figure(go.Bar(
-                x=tipo_summary.reset_index()['tipo'],
-                y=tipo_summary['ER% Promedio'],
+                x=tipo_summary.index.to_numpy(),
+                y=tipo_er,
                 marker_color=CHART_COLORS[:len(tipo_summary)],
-                                text=tipo_summary['ER% Promedio'],
+                text=tipo_er,
                 texttemplate='%{text:.2f}%',
                 textposition='outside',
             ))
             fig_tipo.update_layout(
                 **CHART_LAYOUT,
                 height=380,
-                title=dict(text="Engagement rate por tipo de contenido", font=dict(size=14, color="#e5e7eb")),
+                title=dict(text="Engagement rate por tipo de contenido", font=TITLE_FONT),
                 yaxis_title="",
                 xaxis_title="",
                 showlegend=False,
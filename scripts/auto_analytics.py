@@ -10,15 +10,20 @@ Uso:
 import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta
+from functools import lru_cache
 import logging
 
 # Agregar el directorio raíz al path para imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import pandas as pd
 from src.linkedin import LinkedInClient
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text
+from sqlalchemy import create_engine, event, insert, inspect, select, func, Column, Integer, String, Float, DateTime, Text, Index
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.exc import IntegrityError
 from dotenv import load_dotenv
@@ -45,7 +50,7 @@ class LinkedInMetric(Base):
     __tablename__ = 'linkedin_metrics'
 
     id = Column(Integer, primary_key=True)
-    post_id = Column(String(255), nullable=False, index=True)
+    post_id = Column(String(255), nullable=False)
     post_date = Column(DateTime, nullable=True)
     post_text = Column(Text, nullable=True)
     post_type = Column(String(50), nullable=True)
@@ -62,6 +67,9 @@ class LinkedInMetric(Base):
     collected_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
+    # Última medición por post: búsqueda por índice; también cubre los filtros solo por post_id
+    __table_args__ = (Index('ix_linkedin_metrics_post_collected', 'post_id', collected_at.desc()),)
+
     def __repr__(self):
         return f"<LinkedInMetric(post_id='{self.post_id}', impresiones={self.impresiones}, ER={self.engagement_rate}%)>"
 
@@ -71,7 +79,7 @@ class LinkedInFollowerMetric(Base):
     __tablename__ = 'linkedin_follower_metrics'
 
     id = Column(Integer, primary_key=True)
-    date = Column(DateTime, nullable=False, index=True)
+    date = Column(DateTime, nullable=False)
     ganancia_organica = Column(Integer, default=0)
     ganancia_pagada = Column(Integer, default=0)
     ganancia_total = Column(Integer, default=0)
@@ -79,12 +87,32 @@ class LinkedInFollowerMetric(Base):
 
     collected_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
+    # Un registro por día: destino del ON CONFLICT en collect_follower_growth
+    __table_args__ = (Index('uq_linkedin_follower_metrics_date', 'date', unique=True),)
+
     def __repr__(self):
         return f"<LinkedInFollowerMetric(date='{self.date}', ganancia={self.ganancia_total})>"
 
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    PRAGMAs por conexión SQLite: WAL (los lectores no bloquean al escritor), synchronous=NORMAL
+    (menos fsyncs por commit) y temporales/caché de páginas (64 MB) en memoria.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.close()
+
+
+@lru_cache(maxsize=None)
 def get_database_engine():
-    """Obtiene el engine de la base de datos según configuración."""
+    """
+    Obtiene el engine de la base de datos según configuración.
+    Se crea una sola vez por proceso: el servicio reutiliza su pool de conexiones en cada ciclo.
+    """
     USE_POSTGRES = os.getenv("USE_POSTGRES", "false").lower() == "true"
 
     if USE_POSTGRES:
@@ -95,7 +123,13 @@ def get_database_engine():
         POSTGRES_DB = os.getenv("POSTGRES_DB", "publicador_rrss")
 
         DB_URL = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
-        engine = create_engine(DB_URL, pool_pre_ping=True)
+        engine = create_engine(
+            DB_URL,
+            pool_pre_ping=True,
+            pool_size=5,
+            max_overflow=5,
+            pool_recycle=1800  # Renovar conexiones antes de que el servidor las cierre por inactividad
+        )
         logger.info(f"✅ Conectado a PostgreSQL: {POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}")
     else:
         DB_DIR = "data"
@@ -103,11 +137,29 @@ def get_database_engine():
             os.makedirs(DB_DIR)
         DB_URL = f"sqlite:///{os.path.join(DB_DIR, 'posts.db')}"
         engine = create_engine(DB_URL, connect_args={"check_same_thread": False})
+        event.listen(engine, "connect", _set_sqlite_pragmas)
         logger.info(f"✅ Conectado a SQLite: {DB_URL}")
 
     return engine
 
 
+def get_latest_impressions(session, post_ids):
+    """
+    Devuelve {post_id: impresiones} del registro más reciente de cada post, en una sola consulta.
+    """
+    latest = (
+        select(LinkedInMetric.post_id, func.max(LinkedInMetric.collected_at).label('collected_at'))
+        .where(LinkedInMetric.post_id.in_(post_ids))
+        .group_by(LinkedInMetric.post_id)
+        .subquery()
+    )
+    stmt = select(LinkedInMetric.post_id, LinkedInMetric.impresiones).join(
+        latest,
+        (LinkedInMetric.post_id == latest.c.post_id) & (LinkedInMetric.collected_at == latest.c.collected_at)
+    )
+    return dict(session.execute(stmt).all())
+
+
 def collect_linkedin_metrics(api_client, session, num_posts=50):
     """
     Recopila métricas de los posts recientes de LinkedIn y las guarda en la BD.
@@ -129,7 +181,7 @@ def collect_linkedin_metrics(api_client, session, num_posts=50):
 
         post_ids = [p['post_id'] for p in posts_data]
 
-        # Obtener métricas
+        # Obtener métricas (el cliente trocea y paraleliza las peticiones)
         df_metrics = api_client.get_post_metrics(post_ids)
 
         if df_metrics is None or df_metrics.empty:
@@ -140,65 +192,68 @@ def collect_linkedin_metrics(api_client, session, num_posts=50):
         metrics_saved = 0
         metrics_updated = 0
 
-        for post in posts_data:
+        # Índice por post_id para no filtrar el DataFrame en cada iteración.
+        # Tipos fijados una vez sobre las columnas; to_dict devuelve int/float nativos de Python
+        metrics_by_id = (
+            df_metrics.drop_duplicates('post_id')
+            .astype({'impresiones': int, 'clics': int, 'likes': int, 'comentarios': int,
+                     'compartidos': int, 'ER%': float})
+            .set_index('post_id')
+            .to_dict(orient='index')
+        )
+
+        # Última medición guardada de cada post (para comparar impresiones)
+        last_impressions = get_latest_impressions(session, post_ids)
+
+        # Fechas de todos los posts parseadas de una vez; vacías o inválidas quedan en None
+        parsed_dates = pd.to_datetime([p.get('fecha') for p in posts_data], format='%Y-%m-%d %H:%M', errors='coerce')
+        post_dates = [None if pd.isna(ts) else ts.to_pydatetime() for ts in parsed_dates]
+
+        metric_rows = []
+        for post, post_date in zip(posts_data, post_dates):
             post_id = post['post_id']
 
             # Buscar métricas correspondientes
-            metrics_row = df_metrics[df_metrics['post_id'] == post_id]
+            metrics = metrics_by_id.get(post_id)
 
-            if metrics_row.empty:
+            if metrics is None:
                 continue
 
-            metrics = metrics_row.iloc[0]
-
-            # Verificar si ya existe este post en la BD
-            existing_metric = session.query(LinkedInMetric).filter_by(
-                post_id=post_id
-            ).order_by(LinkedInMetric.collected_at.desc()).first()
-
-            # Parsear fecha del post
-            post_date = None
-            if post.get('fecha'):
-                try:
-                    from datetime import datetime as dt
-                    post_date = dt.strptime(post['fecha'], '%Y-%m-%d %H:%M')
-                except:
-                    pass
-
-            # Crear nuevo registro de métrica
-            new_metric = LinkedInMetric(
-                post_id=post_id,
-                post_date=post_date,
-                post_text=post.get('texto_completo', post.get('texto_corto', '')),
-                post_type=post.get('tipo', 'Desconocido'),
-                impresiones=int(metrics.get('impresiones', 0)),
-                clics=int(metrics.get('clics', 0)),
-                likes=int(metrics.get('likes', 0)),
-                comentarios=int(metrics.get('comentarios', 0)),
-                compartidos=int(metrics.get('compartidos', 0)),
-                engagement_rate=float(metrics.get('ER%', 0.0))
-            )
-
-            session.add(new_metric)
+            # Nuevo registro de métrica (se insertan todos juntos al final)
+            new_metric = {
+                'post_id': post_id,
+                'post_date': post_date,
+                'post_text': post.get('texto_completo', post.get('texto_corto', '')),
+                'post_type': post.get('tipo', 'Desconocido'),
+                'impresiones': metrics['impresiones'],
+                'clics': metrics['clics'],
+                'likes': metrics['likes'],
+                'comentarios': metrics['comentarios'],
+                'compartidos': metrics['compartidos'],
+                'engagement_rate': metrics['ER%']
+            }
+
+            metric_rows.append(new_metric)
             metrics_saved += 1
 
             # Logging detallado
-            if existing_metric:
+            if post_id in last_impressions:
                 # Comparar con métrica anterior
-                impr_diff = new_metric.impresiones - existing_metric.impresiones
+                impr_diff = new_metric['impresiones'] - last_impressions[post_id]
                 logger.info(
-                    f"📝 Post {post_id[:20]}... actualizado: "
-                    f"{new_metric.impresiones} impresiones (+{impr_diff}), "
-                    f"ER: {new_metric.engagement_rate:.2f}%"
+                    "📝 Post %s... actualizado: %d impresiones (%+d), ER: %.2f%%",
+                    post_id[:20], new_metric['impresiones'], impr_diff, new_metric['engagement_rate']
                 )
                 metrics_updated += 1
             else:
                 logger.info(
-                    f"✨ Nuevo post detectado: {post_id[:20]}... "
-                    f"{new_metric.impresiones} impresiones, "
-                    f"ER: {new_metric.engagement_rate:.2f}%"
+                    "✨ Nuevo post detectado: %s... %d impresiones, ER: %.2f%%",
+                    post_id[:20], new_metric['impresiones'], new_metric['engagement_rate']
                 )
 
+        # Inserción Core en bloque: sin instancias ORM ni unit-of-work por post
+        if metric_rows:
+            session.execute(insert(LinkedInMetric.__table__), metric_rows)
         session.commit()
 
         logger.info(f"✅ Métricas guardadas: {metrics_saved} nuevos registros")
@@ -230,36 +285,41 @@ def collect_follower_growth(api_client, session, days=7):
             logger.warning("⚠️  No se pudieron obtener datos de crecimiento")
             return 0
 
-        records_saved = 0
-
-        for _, row in df_growth.iterrows():
-            fecha = row['fecha']
-
-            # Verificar si ya existe este día
-            existing = session.query(LinkedInFollowerMetric).filter_by(
-                date=fecha
-            ).first()
-
-            if existing:
-                # Actualizar
-                existing.ganancia_organica = int(row['ganancia_organica'])
-                existing.ganancia_pagada = int(row['ganancia_pagada'])
-                existing.ganancia_total = int(row['ganancia_total'])
-                existing.collected_at = datetime.utcnow()
-            else:
-                # Crear nuevo
-                new_record = LinkedInFollowerMetric(
-                    date=fecha,
-                    ganancia_organica=int(row['ganancia_organica']),
-                    ganancia_pagada=int(row['ganancia_pagada']),
-                    ganancia_total=int(row['ganancia_total'])
-                )
-                session.add(new_record)
-                records_saved += 1
-
+        # Payload del upsert construido de una vez, sin un Series por fila.
+        # Las fechas pasan a datetime (medianoche) para que el conteo de días
+        # existentes y el upsert comparen exactamente el mismo valor guardado.
+        rows = (
+            df_growth[['fecha', 'ganancia_organica', 'ganancia_pagada', 'ganancia_total']]
+            .astype({'ganancia_organica': int, 'ganancia_pagada': int, 'ganancia_total': int})
+            .rename(columns={'fecha': 'date'})
+            .assign(date=lambda df: pd.to_datetime(df['date']))
+            .assign(collected_at=datetime.utcnow())
+            .to_dict('records')
+        )
+
+        # Días ya guardados: el valor devuelto cuenta solo los días nuevos, no los actualizados
+        table = LinkedInFollowerMetric.__table__
+        existing_days = session.execute(
+            select(func.count()).select_from(table).where(table.c.date.in_([r['date'] for r in rows]))
+        ).scalar_one()
+
+        # Upsert por fecha en una sola sentencia (crea los días nuevos y actualiza los existentes)
+        insert_fn = pg_insert if session.get_bind().dialect.name == 'postgresql' else sqlite_insert
+        stmt = insert_fn(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['date'],
+            set_={
+                'ganancia_organica': stmt.excluded.ganancia_organica,
+                'ganancia_pagada': stmt.excluded.ganancia_pagada,
+                'ganancia_total': stmt.excluded.ganancia_total,
+                'collected_at': stmt.excluded.collected_at
+            }
+        )
+        session.execute(stmt)
         session.commit()
 
-        logger.info(f"✅ Datos de seguidores guardados: {records_saved} registros")
+        records_saved = len(rows) - existing_days
+        logger.info(f"✅ Datos de seguidores guardados: {records_saved} registros nuevos, {existing_days} actualizados")
 
         return records_saved
 
@@ -269,6 +329,54 @@ def collect_follower_growth(api_client, session, days=7):
         return 0
 
 
+def _run_with_session(session_factory, collector, api_client, **kwargs):
+    """Ejecuta un collector con su propia sesión (las sesiones no se comparten entre hilos)."""
+    with session_factory() as session:
+        return collector(api_client, session, **kwargs)
+
+
+@lru_cache(maxsize=None)
+def get_session_factory():
+    """Fábrica de sesiones ligada al engine compartido."""
+    return sessionmaker(bind=get_database_engine())
+
+
+def _dedupe_follower_days(conn):
+    """Deja una sola fila por fecha (la más reciente) en linkedin_follower_metrics."""
+    table = LinkedInFollowerMetric.__table__
+    keep = select(func.max(table.c.id)).group_by(table.c.date)
+    removed = conn.execute(table.delete().where(table.c.id.not_in(keep))).rowcount
+    if removed:
+        logger.warning(f"⚠️  Eliminados {removed} registros de seguidores duplicados por fecha")
+
+
+@lru_cache(maxsize=None)
+def init_database():
+    """
+    Crea las tablas y los índices que falten. Se ejecuta una vez por proceso.
+    Las tablas creadas antes de existir los índices no los tienen: antes de crear
+    el índice único de seguidores (destino del upsert) se eliminan fechas duplicadas.
+    """
+    engine = get_database_engine()
+    Base.metadata.create_all(engine)
+
+    tables = (LinkedInMetric.__table__, LinkedInFollowerMetric.__table__)
+    existing = {t.name: {ix['name'] for ix in inspect(engine).get_indexes(t.name)} for t in tables}
+    try:
+        with engine.begin() as conn:
+            for table in tables:
+                for index in table.indexes:
+                    if index.name in existing[table.name]:
+                        continue
+                    if table is LinkedInFollowerMetric.__table__ and index.unique:
+                        _dedupe_follower_days(conn)
+                    index.create(conn)
+                    logger.info(f"✅ Índice creado: {index.name}")
+    except Exception as e:
+        logger.critical(f"❌ No se pudieron crear los índices de analytics: {e}")
+        raise
+
+
 def run_analytics_cycle():
     """Ejecuta un ciclo completo de recopilación de analytics."""
     try:
@@ -278,24 +386,23 @@ def run_analytics_cycle():
         # Obtener engine de base de datos
         engine = get_database_engine()
 
-        # Crear tablas si no existen
-        Base.metadata.create_all(engine)
+        # Crear tablas e índices si no existen (una sola vez por proceso)
+        init_database()
 
-        # Crear sesión
-        Session = sessionmaker(bind=engine)
-        session = Session()
+        # Fábrica de sesiones (una sesión por collector)
+        Session = get_session_factory()
 
         logger.info("\n" + "="*60)
         logger.info("🚀 INICIANDO RECOPILACIÓN DE MÉTRICAS")
         logger.info("="*60)
 
-        # Recopilar métricas de posts
-        posts_collected = collect_linkedin_metrics(api, session, num_posts=30)
-
-        # Recopilar crecimiento de seguidores
-        followers_collected = collect_follower_growth(api, session, days=7)
+        # Métricas de posts y crecimiento de seguidores usan endpoints independientes: en paralelo
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            f_posts = executor.submit(_run_with_session, Session, collect_linkedin_metrics, api, num_posts=30)
+            f_followers = executor.submit(_run_with_session, Session, collect_follower_growth, api, days=7)
 
-        session.close()
+        posts_collected = f_posts.result()
+        followers_collected = f_followers.result()
 
         logger.info("\n" + "="*60)
         logger.info("✅ CICLO DE RECOPILACIÓN COMPLETADO")
@@ -6,6 +6,8 @@ import logging
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
 # Configuración de logging
@@ -24,12 +26,19 @@ def get_organizations():
         logger.error("❌ No se encontró ACCESS_TOKEN_LINKEDIN en el archivo .env")
         return
 
-    headers = {"Authorization": f"Bearer {access_token}"}
+    # Una sola sesión: ambas peticiones reutilizan la conexión TLS con api.linkedin.com
+    session = requests.Session()
+    session.headers.update({"Authorization": f"Bearer {access_token}"})
+    session.mount("https://", HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=3, backoff_factor=0.5)
+    ))
 
     try:
         # Primero obtener el ID del usuario
         logger.info("🔍 Obteniendo información del usuario...")
-        user_response = requests.get("https://api.linkedin.com/v2/userinfo", headers=headers)
+        user_response = session.get("https://api.linkedin.com/v2/userinfo")
         user_response.raise_for_status()
         user_info = user_response.json()
         user_id = user_info.get('sub')
@@ -47,7 +56,7 @@ def get_organizations():
         # Endpoint para obtener organizaciones (requiere permiso w_organization_social o r_organization_social)
         org_url = f"https://api.linkedin.com/v2/organizationAcls?q=roleAssignee&role=ADMINISTRATOR&projection=(elements*(organization~(localizedName,vanityName),organizationalTarget))"
 
-        org_response = requests.get(org_url, headers=headers)
+        org_response = session.get(org_url)
 
         if org_response.status_code == 403:
             print("\n" + "="*70)
@@ -115,6 +124,8 @@ def get_organizations():
         logger.error(f"❌ ERROR inesperado: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        session.close()
 
 
 if __name__ == "__main__":
@@ -11,9 +11,12 @@ from pathlib import Path
 # Agregar el directorio raíz al path para imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from sqlalchemy import create_engine, inspect
-from sqlalchemy.orm import sessionmaker
-from src.db_config import Base, Post, MediaAsset, Contact, ContactList, EmailSendLog, EmailSendResult
+from sqlalchemy import create_engine, event, insert, inspect, select
+from sqlalchemy.orm import selectinload, sessionmaker
+from src.db_config import (
+    Base, Post, MediaAsset, Contact, ContactList, EmailSendLog, EmailSendResult,
+    post_media_association, contact_list_association
+)
 from dotenv import load_dotenv
 import logging
 
@@ -24,6 +27,53 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Filas por sentencia INSERT multi-VALUES
+BATCH_SIZE = 10000
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    PRAGMAs por conexión SQLite: WAL (los lectores no bloquean al escritor), synchronous=NORMAL
+    (menos fsyncs por commit) y temporales/caché de páginas (64 MB) en memoria.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.close()
+
+
+def _bulk_insert(session, table, rows):
+    """Inserta una lista de dicts en lotes de BATCH_SIZE (un INSERT multi-VALUES por lote)."""
+    for start in range(0, len(rows), BATCH_SIZE):
+        session.execute(insert(table), rows[start:start + BATCH_SIZE])
+    return len(rows)
+
+
+def _bulk_insert_ids(session, table, rows):
+    """Como _bulk_insert, pero devuelve los IDs generados en el mismo orden que rows."""
+    ids = []
+    for start in range(0, len(rows), BATCH_SIZE):
+        result = session.execute(
+            insert(table).returning(table.c.id, sort_by_parameter_order=True),
+            rows[start:start + BATCH_SIZE]
+        )
+        ids.extend(result.scalars())
+    return ids
+
+
+def _iter_chunks(session, stmt):
+    """
+    Recorre el resultado de stmt en bloques de BATCH_SIZE objetos sin materializar la tabla entera.
+    Cada bloque se desasocia de la sesión una vez procesado para que la memoria no crezca.
+    """
+    result = session.execute(stmt.execution_options(yield_per=BATCH_SIZE)).scalars()
+    for chunk in result.partitions():
+        yield chunk
+        session.expunge_all()
+
+
 def migrate_data():
     """Migra datos de SQLite a PostgreSQL."""
 
@@ -38,6 +88,7 @@ def migrate_data():
 
     sqlite_url = f"sqlite:///{sqlite_path}"
     sqlite_engine = create_engine(sqlite_url, connect_args={"check_same_thread": False})
+    event.listen(sqlite_engine, "connect", _set_sqlite_pragmas)
     SqliteSession = sessionmaker(bind=sqlite_engine)
 
     # Conexión a PostgreSQL (destino)
@@ -50,7 +101,15 @@ def migrate_data():
     postgres_url = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
 
     try:
-        postgres_engine = create_engine(postgres_url, pool_pre_ping=True)
+        # psycopg2: INSERT en lotes multi-VALUES de BATCH_SIZE filas y el resto de executemany
+        # (UPDATE/DELETE) agrupado con execute_batch
+        postgres_engine = create_engine(
+            postgres_url,
+            pool_pre_ping=True,
+            executemany_mode='values_plus_batch',
+            insertmanyvalues_page_size=BATCH_SIZE,
+            executemany_batch_page_size=500
+        )
 
         # Test de conexión
         with postgres_engine.connect() as conn:
@@ -80,120 +139,130 @@ def migrate_data():
     try:
         # Migrar MediaAssets primero (sin dependencias)
         logger.info("\n🖼️  Migrando MediaAssets...")
-        media_assets = sqlite_session.query(MediaAsset).all()
-        for media in media_assets:
-            # Crear nuevo objeto sin ID (PostgreSQL lo generará)
-            new_media = MediaAsset(
-                file_path=media.file_path,
-                file_type=media.file_type,
-                original_filename=media.original_filename,
-                created_at=media.created_at
-            )
-            postgres_session.add(new_media)
-        postgres_session.commit()
-        logger.info(f"✅ {len(media_assets)} MediaAssets migrados")
+        # file_path -> ID en PostgreSQL, tomado del RETURNING para resolver las relaciones de Posts
+        ma_map = {}
+        for media_assets in _iter_chunks(sqlite_session, select(MediaAsset)):
+            # Sin ID: PostgreSQL lo generará
+            media_ids = _bulk_insert_ids(postgres_session, MediaAsset.__table__, [
+                {
+                    'file_path': media.file_path,
+                    'file_type': media.file_type,
+                    'original_filename': media.original_filename,
+                    'created_at': media.created_at
+                }
+                for media in media_assets
+            ])
+            postgres_session.commit()
+            ma_map.update(zip((media.file_path for media in media_assets), media_ids))
+        media_count = len(ma_map)
+        logger.info(f"✅ {media_count} MediaAssets migrados")
 
         # Migrar ContactLists
         logger.info("\n📋 Migrando ContactLists...")
-        contact_lists = sqlite_session.query(ContactList).all()
-        for lst in contact_lists:
-            new_list = ContactList(
-                name=lst.name,
-                created_at=lst.created_at
-            )
-            postgres_session.add(new_list)
-        postgres_session.commit()
-        logger.info(f"✅ {len(contact_lists)} ContactLists migrados")
+        # name -> ID en PostgreSQL, tomado del RETURNING para resolver las relaciones de Contacts
+        cl_map = {}
+        for contact_lists in _iter_chunks(sqlite_session, select(ContactList)):
+            list_ids = _bulk_insert_ids(postgres_session, ContactList.__table__, [
+                {'name': lst.name, 'created_at': lst.created_at}
+                for lst in contact_lists
+            ])
+            postgres_session.commit()
+            cl_map.update(zip((lst.name for lst in contact_lists), list_ids))
+        list_count = len(cl_map)
+        logger.info(f"✅ {list_count} ContactLists migrados")
 
         # Migrar Contacts
         logger.info("\n👥 Migrando Contacts...")
-        contacts = sqlite_session.query(Contact).all()
-        for contact in contacts:
-            new_contact = Contact(
-                name=contact.name,
-                phone=contact.phone,
-                email=contact.email
-            )
-            # Copiar relaciones con listas
-            for lst in contact.lists:
-                # Buscar la lista correspondiente en PostgreSQL
-                pg_list = postgres_session.query(ContactList).filter_by(name=lst.name).first()
-                if pg_list:
-                    new_contact.lists.append(pg_list)
-
-            postgres_session.add(new_contact)
-        postgres_session.commit()
-        logger.info(f"✅ {len(contacts)} Contacts migrados")
+        # Relaciones con listas resueltas por nombre en memoria (cl_map)
+        contact_count = 0
+        for contacts in _iter_chunks(sqlite_session, select(Contact).options(selectinload(Contact.lists))):
+            contact_ids = _bulk_insert_ids(postgres_session, Contact.__table__, [
+                {'name': contact.name, 'phone': contact.phone, 'email': contact.email}
+                for contact in contacts
+            ])
+            _bulk_insert(postgres_session, contact_list_association, [
+                {'contact_id': contact_id, 'list_id': cl_map[lst.name]}
+                for contact, contact_id in zip(contacts, contact_ids)
+                for lst in contact.lists
+                if lst.name in cl_map
+            ])
+            postgres_session.commit()
+            contact_count += len(contact_ids)
+        logger.info(f"✅ {contact_count} Contacts migrados")
 
         # Migrar Posts
         logger.info("\n📝 Migrando Posts...")
-        posts = sqlite_session.query(Post).all()
-        for post in posts:
-            new_post = Post(
-                title=post.title,
-                content=post.content,
-                content_html=post.content_html,
-                asunto=post.asunto,
-                platform=post.platform,
-                fecha_hora=post.fecha_hora,
-                sent_at=post.sent_at,
-                contacts=post.contacts,
-                created_at=post.created_at,
-                updated_at=post.updated_at
-            )
-
-            # Copiar relaciones con media
-            for media in post.media_assets:
-                # Buscar el media correspondiente en PostgreSQL
-                pg_media = postgres_session.query(MediaAsset).filter_by(
-                    file_path=media.file_path
-                ).first()
-                if pg_media:
-                    new_post.media_assets.append(pg_media)
-
-            postgres_session.add(new_post)
-        postgres_session.commit()
-        logger.info(f"✅ {len(posts)} Posts migrados")
+        # Relaciones con media resueltas por file_path en memoria (ma_map)
+        post_count = 0
+        for posts in _iter_chunks(sqlite_session, select(Post).options(selectinload(Post.media_assets))):
+            post_ids = _bulk_insert_ids(postgres_session, Post.__table__, [
+                {
+                    'title': post.title,
+                    'content': post.content,
+                    'content_html': post.content_html,
+                    'asunto': post.asunto,
+                    'platform': post.platform,
+                    'fecha_hora': post.fecha_hora,
+                    'sent_at': post.sent_at,
+                    'contacts': post.contacts,
+                    'created_at': post.created_at,
+                    'updated_at': post.updated_at
+                }
+                for post in posts
+            ])
+            _bulk_insert(postgres_session, post_media_association, [
+                {'post_id': post_id, 'media_id': ma_map[media.file_path]}
+                for post, post_id in zip(posts, post_ids)
+                for media in post.media_assets
+                if media.file_path in ma_map
+            ])
+            postgres_session.commit()
+            post_count += len(post_ids)
+        logger.info(f"✅ {post_count} Posts migrados")
 
         # Migrar EmailSendLogs
         logger.info("\n📧 Migrando EmailSendLogs...")
-        email_logs = sqlite_session.query(EmailSendLog).all()
-        for log in email_logs:
-            new_log = EmailSendLog(
-                post_id=log.post_id,
-                platform=log.platform,
-                subject=log.subject,
-                total_recipients=log.total_recipients,
-                successful_count=log.successful_count,
-                failed_count=log.failed_count,
-                started_at=log.started_at,
-                completed_at=log.completed_at
-            )
-            postgres_session.add(new_log)
-        postgres_session.commit()
-        logger.info(f"✅ {len(email_logs)} EmailSendLogs migrados")
+        # ID en SQLite -> ID en PostgreSQL, tomado del RETURNING para enlazar los EmailSendResults
+        log_map = {}
+        for email_logs in _iter_chunks(sqlite_session, select(EmailSendLog)):
+            log_ids = _bulk_insert_ids(postgres_session, EmailSendLog.__table__, [
+                {
+                    'post_id': log.post_id,
+                    'platform': log.platform,
+                    'subject': log.subject,
+                    'total_recipients': log.total_recipients,
+                    'successful_count': log.successful_count,
+                    'failed_count': log.failed_count,
+                    'started_at': log.started_at,
+                    'completed_at': log.completed_at
+                }
+                for log in email_logs
+            ])
+            postgres_session.commit()
+            log_map.update(zip((log.id for log in email_logs), log_ids))
+        log_count = len(log_map)
+        logger.info(f"✅ {log_count} EmailSendLogs migrados")
 
         # Migrar EmailSendResults
         logger.info("\n📨 Migrando EmailSendResults...")
-        email_results = sqlite_session.query(EmailSendResult).all()
-        for result in email_results:
-            # Buscar el log correspondiente en PostgreSQL
-            pg_log = postgres_session.query(EmailSendLog).filter_by(
-                started_at=result.send_log.started_at
-            ).first()
-
-            if pg_log:
-                new_result = EmailSendResult(
-                    send_log_id=pg_log.id,
-                    recipient_email=result.recipient_email,
-                    success=result.success,
-                    error_code=result.error_code,
-                    error_message=result.error_message,
-                    sent_at=result.sent_at
-                )
-                postgres_session.add(new_result)
-        postgres_session.commit()
-        logger.info(f"✅ {len(email_results)} EmailSendResults migrados")
+        # Log correspondiente en PostgreSQL, resuelto por su ID de SQLite (log_map)
+        result_count = 0
+        for email_results in _iter_chunks(sqlite_session, select(EmailSendResult)):
+            _bulk_insert(postgres_session, EmailSendResult.__table__, [
+                {
+                    'send_log_id': log_map[result.send_log_id],
+                    'recipient_email': result.recipient_email,
+                    'success': result.success,
+                    'error_code': result.error_code,
+                    'error_message': result.error_message,
+                    'sent_at': result.sent_at
+                }
+                for result in email_results
+                if result.send_log_id in log_map
+            ])
+            postgres_session.commit()
+            result_count += len(email_results)
+        logger.info(f"✅ {result_count} EmailSendResults migrados")
 
         logger.info("\n" + "="*60)
         logger.info("🎉 ¡MIGRACIÓN COMPLETADA EXITOSAMENTE!")
@@ -202,12 +271,12 @@ def migrate_data():
         logger.info(f"   SQLite: {sqlite_path}")
         logger.info(f"   PostgreSQL: {POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}")
         logger.info(f"\n📊 Resumen:")
-        logger.info(f"   - {len(media_assets)} MediaAssets")
-        logger.info(f"   - {len(contact_lists)} ContactLists")
-        logger.info(f"   - {len(contacts)} Contacts")
-        logger.info(f"   - {len(posts)} Posts")
-        logger.info(f"   - {len(email_logs)} EmailSendLogs")
-        logger.info(f"   - {len(email_results)} EmailSendResults")
+        logger.info(f"   - {media_count} MediaAssets")
+        logger.info(f"   - {list_count} ContactLists")
+        logger.info(f"   - {contact_count} Contacts")
+        logger.info(f"   - {post_count} Posts")
+        logger.info(f"   - {log_count} EmailSendLogs")
+        logger.info(f"   - {result_count} EmailSendResults")
         logger.info("\n💡 Próximos pasos:")
         logger.info("   1. Verifica que los datos estén correctos en PostgreSQL")
         logger.info("   2. Actualiza tu archivo .env con USE_POSTGRES='true'")
@@ -1,10 +1,17 @@
 import os
+from functools import lru_cache
 import google.generativeai as genai
 from dotenv import load_dotenv
 
 # Cargar variables de entorno
 load_dotenv()
 
+@lru_cache(maxsize=4)
+def get_model(model_name):
+    """Instancia de GenerativeModel reutilizada por proceso para cada nombre de modelo."""
+    return genai.GenerativeModel(model_name)
+
+
 def test_gemini():
     """
     Script simple para probar la conexión con la API de Google Gemini.
@@ -25,7 +32,7 @@ def test_gemini():
         # Seleccionar el modelo (gemini-1.5-flash es rápido y eficiente, o gemini-pro)
         model_name = 'gemini-1.5-flash'
         print(f"🤖 Usando modelo: {model_name}")
-        model = genai.GenerativeModel(model_name)
+        model = get_model(model_name)
 
         # Prompt de prueba
         prompt = "Escribe una frase motivadora corta para un programador Python."
@@ -1,9 +1,14 @@
 import streamlit as st
+import hmac
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Credenciales leídas una sola vez al importar el módulo
+_APP_USERNAME = os.getenv("APP_USERNAME", "admin")
+_APP_PASSWORD = os.getenv("APP_PASSWORD")
+
 def login_form():
     """Muestra un formulario de inicio de sesión y oculta la navegación."""
     st.markdown("""
@@ -41,14 +46,14 @@ def login_form():
 
         
         if st.button("Iniciar Sesión", use_container_width=True):
-            correct_username = os.getenv("APP_USERNAME", "admin")
-            correct_password = os.getenv("APP_PASSWORD")
-            
-            if not correct_password:
+            if not _APP_PASSWORD:
                 st.error("⚠️ Configuración de seguridad incompleta. Falta APP_PASSWORD en el archivo .env")
                 return
-            
-            if username == correct_username and password == correct_password:
+
+            # Comparación en tiempo constante
+            username_ok = hmac.compare_digest(username.encode(), _APP_USERNAME.encode())
+            password_ok = hmac.compare_digest(password.encode(), _APP_PASSWORD.encode())
+            if username_ok and password_ok:
                 st.session_state.authenticated = True
                 st.success("Acceso concedido")
                 st.rerun()
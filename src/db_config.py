@@ -3,7 +3,7 @@ import json
 import re
 from datetime import datetime
 from typing import List, Optional, Dict, Any, Set
-from sqlalchemy import create_engine, Column, Integer, String, Text, Table, ForeignKey, CheckConstraint
+from sqlalchemy import create_engine, select, insert, Column, Integer, String, Text, Table, ForeignKey, CheckConstraint
 from sqlalchemy.orm import sessionmaker, relationship, declarative_base, joinedload
 from sqlalchemy.exc import IntegrityError
 import logging
@@ -501,7 +501,7 @@ def title_already_exists(title: str) -> bool:
     Verifica si ya existe un post con el mismo título.
     """
     with get_db_session() as session:
-        return session.query(Post).filter(Post.title == title).first() is not None
+        return session.scalar(select(Post.id).where(Post.title == title).limit(1)) is not None
 
 
 def get_all_posts() -> List[Dict[str, Any]]:
@@ -835,6 +835,31 @@ def add_email_send_result(
         session.add(result)
 
 
+def add_email_send_results(send_log_id: int, results: List[Dict[str, Any]]):
+    """
+    Añade varios resultados de envío de email en un único INSERT.
+
+    Args:
+        send_log_id: ID del log de envío
+        results: Lista de dicts con recipient_email, success y, opcionalmente,
+                 error_code y error_message
+    """
+    if not results:
+        return
+    rows = [
+        {
+            "send_log_id": send_log_id,
+            "recipient_email": r["recipient_email"],
+            "success": 1 if r["success"] else 0,
+            "error_code": r.get("error_code"),
+            "error_message": r.get("error_message"),
+        }
+        for r in results
+    ]
+    with get_db_session() as session:
+        session.execute(insert(EmailSendResult), rows)
+
+
 def complete_email_send_log(send_log_id: int, successful_count: int, failed_count: int):
     """
     Marca un log de envío como completado con los contadores finales.
@@ -948,8 +973,8 @@ def mark_email_as_bounced(recipient_email: str, error_message: str = 'Rebote NDR
             result.error_code = 'NDR_BOUNCE'
             result.error_message = error_message[:500]
             updated += 1
-            # Ajustar contadores del log padre
-            log = session.query(EmailSendLog).filter(EmailSendLog.id == result.send_log_id).first()
+            # Ajustar contadores del log padre (get usa el identity map: un log con varios rebotes se consulta una vez)
+            log = session.get(EmailSendLog, result.send_log_id)
             if log:
                 if log.successful_count and log.successful_count > 0:
                     log.successful_count -= 1
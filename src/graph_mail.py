@@ -5,41 +5,206 @@ Ideal para organizaciones con Microsoft 365 que tienen SMTP AUTH deshabilitado.
 
 import os
 import re
+import json
 import time
+import logging
 import uuid
-import base64
+import binascii
+import queue
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Optional
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
 
 try:
     import dns.resolver
     _DNS_AVAILABLE = True
 except ImportError:
     _DNS_AVAILABLE = False
-    print("Advertencia: dnspython no instalado. La validación de dominio de correo estará desactivada.")
+    logger.warning("dnspython no instalado. La validación de dominio de correo estará desactivada.")
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 try:
     from msal import ConfidentialClientApplication
 except ImportError:
     ConfidentialClientApplication = None
-    print("Advertencia: msal no está instalado. Ejecuta: pip install msal")
+    logger.warning("msal no está instalado. Ejecuta: pip install msal")
 
 # -----------------------------
 # DB logging (opcional)
 # -----------------------------
 try:
-    from .db_config import create_email_send_log, add_email_send_result, complete_email_send_log
+    from .db_config import create_email_send_log, add_email_send_results, complete_email_send_log
 except Exception:
     create_email_send_log = None
-    add_email_send_result = None
+    add_email_send_results = None
     complete_email_send_log = None
 
+# Máximo de resultados que el hilo escritor agrupa en un mismo INSERT
+_DB_WRITE_BATCH = 100
+
+
+def _db_result_writer(send_log_id: int, results_queue: queue.Queue) -> None:
+    """Consume resultados de envío de la cola y los inserta en BD por lotes hasta recibir None."""
+    done = False
+    while not done:
+        rows = [results_queue.get()]
+        if rows[0] is None:
+            break
+        while len(rows) < _DB_WRITE_BATCH:
+            try:
+                item = results_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                done = True
+                break
+            rows.append(item)
+        try:
+            add_email_send_results(send_log_id, rows)
+        except Exception as e:
+            logger.warning("⚠️ No se pudieron registrar %d resultados en BD: %s", len(rows), e)
+
+
+def _start_result_writer(send_log_id: Optional[int]):
+    """Arranca el hilo escritor de resultados; devuelve (cola, hilo) o (None, None) sin log en BD."""
+    if not send_log_id or add_email_send_results is None:
+        return None, None
+    results_queue = queue.Queue()
+    writer = threading.Thread(target=_db_result_writer, args=(send_log_id, results_queue), daemon=True)
+    writer.start()
+    return results_queue, writer
+
+
+def _queue_result(results_queue, recipient_email: str, success: bool,
+                  error_code: Optional[str] = None, error_message: Optional[str] = None) -> None:
+    if results_queue is not None:
+        results_queue.put({
+            "recipient_email": recipient_email,
+            "success": success,
+            "error_code": error_code,
+            "error_message": error_message,
+        })
+
+
+def _stop_result_writer(results_queue, writer) -> None:
+    """Vacía la cola y espera al hilo escritor (antes de completar el log)."""
+    if results_queue is not None:
+        results_queue.put(None)
+        writer.join()
+
+
+def _open_send_log(subject: str, total_recipients: int, pre_failed: Optional[list] = None):
+    """
+    Crea el log del envío (opcional), arranca su hilo escritor y registra los
+    pre-fallidos (dominio inválido). Devuelve (send_log_id, cola, hilo).
+    """
+    send_log_id = None
+    if create_email_send_log:
+        try:
+            send_log_id = create_email_send_log(platform='Gmail', subject=subject, total_recipients=total_recipients)
+        except Exception as e:
+            logger.warning("⚠️ No se pudo crear log en BD: %s", e)
+    results_queue, writer = _start_result_writer(send_log_id)
+    for pf in pre_failed or ():
+        _queue_result(results_queue, pf['email'], False, error_code='INVALID_DOMAIN', error_message=pf['error'])
+    return send_log_id, results_queue, writer
+
+
+def _finish_send_log(send_log_id: Optional[int], results_queue, writer,
+                     successful_count: int, failed_count: int) -> None:
+    """Detiene el hilo escritor y completa el log del envío (también si el envío falló)."""
+    _stop_result_writer(results_queue, writer)
+    if send_log_id and complete_email_send_log:
+        try:
+            complete_email_send_log(send_log_id=send_log_id,
+                                   successful_count=successful_count,
+                                   failed_count=failed_count)
+        except Exception as e:
+            logger.warning("⚠️ No se pudo completar log en BD: %s", e)
+
 
 # Cargar variables de entorno
 load_dotenv()
 
+# --------------------------------------------------------------------
+# Sesión HTTP compartida para todas las llamadas a Graph
+# --------------------------------------------------------------------
+BULK_MAX_WORKERS = 8
+BATCH_MAX_WORKERS = 4
+BATCH_MAX_RETRIES = 3
+
+# (conexión, lectura) en segundos
+GRAPH_TIMEOUT = (5, 30)
+
+
+def _build_session(pool_size: int = 32) -> requests.Session:
+    """Sesión con pool de conexiones keep-alive y reintentos ante 429/503.
+
+    Solo se reintentan respuestas de throttling (no errores de lectura ni
+    5xx genéricos) para no duplicar correos que Graph ya hubiera aceptado.
+    """
+    retry = Retry(
+        total=5,
+        read=0,
+        backoff_factor=1,
+        status_forcelist=(429, 503),
+        allowed_methods=frozenset({"GET", "POST"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    return session
+
+
+_SESSION = _build_session()
+
+
+# Límite documentado de Graph para Outlook: 10000 peticiones cada 10 minutos por buzón.
+# Solo se frena al acercarse al 95 % de la ventana; los 429 puntuales los
+# resuelve el Retry de la sesión respetando Retry-After.
+GRAPH_RATE_LIMIT = 10000
+GRAPH_RATE_WINDOW = 600
+_RATE_SOFT_LIMIT = int(GRAPH_RATE_LIMIT * 0.95)
+
+_RATE_LOCK = threading.Lock()
+_RATE_TIMESTAMPS = deque()
+
+
+def _throttle(n: int = 1) -> None:
+    """Registra n peticiones de envío y espera solo si la ventana está casi llena."""
+    with _RATE_LOCK:
+        while True:
+            now = time.monotonic()
+            while _RATE_TIMESTAMPS and now - _RATE_TIMESTAMPS[0] >= GRAPH_RATE_WINDOW:
+                _RATE_TIMESTAMPS.popleft()
+            if len(_RATE_TIMESTAMPS) + n <= _RATE_SOFT_LIMIT or not _RATE_TIMESTAMPS:
+                break
+            wait = GRAPH_RATE_WINDOW - (now - _RATE_TIMESTAMPS[0])
+            logger.info("⏳ Cerca del límite de Graph, esperando %.1fs", wait)
+            time.sleep(wait)
+        _RATE_TIMESTAMPS.extend([now] * n)
+
+
+def _dumps(payload) -> bytes:
+    """Serializa a JSON (bytes) con orjson si está disponible; si no, con json."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
 # --------------------------------------------------------------------
 # Logo en base64 para el footer de correo
 # --------------------------------------------------------------------
@@ -102,6 +267,10 @@ EMAIL_FOOTER = f"""
 # --------------------------------------------------------------------
 # Helpers para HTML (footer e imágenes inline) - ANTI DUPLICADOS
 # --------------------------------------------------------------------
+_BODY_CLOSE_RE = re.compile(r"</body>", re.IGNORECASE)
+_PREF_RE = re.compile(r"<!--\s*PREF:(?:(INLINE_IMAGES)|IMG_SIZE:(.*?))\s*-->")
+
+
 def ensure_html_string(content_text: str, content_html: Optional[str]) -> str:
     """Garantiza que tenemos HTML base."""
     if content_html and isinstance(content_html, str) and content_html.strip():
@@ -111,31 +280,6 @@ def ensure_html_string(content_text: str, content_html: Optional[str]) -> str:
     return f"<div>{safe}</div>"
 
 
-def ensure_footer_once(html: str) -> str:
-    """Añade el footer SOLO si no existe el marcador."""
-    if FOOTER_MARKER_TEXT in (html or ""):
-        return html
-    # Insertar antes de </body> si existe; si no, al final
-    if re.search(r"</body>", html, re.IGNORECASE):
-        return re.sub(r"(</body>)", rf"{EMAIL_FOOTER}\1", html, flags=re.IGNORECASE, count=1)
-    return html + EMAIL_FOOTER
-
-
-def insert_inline_images_before_footer(html: str, img_tags: str) -> str:
-    """Inserta las imágenes inline ANTES del footer usando el marcador; si no hay footer, al final/antes de </body>."""
-    if not img_tags:
-        return html
-
-    # Si el footer ya existe, insertamos justo antes del marcador HTML
-    if FOOTER_MARKER_HTML in html:
-        return html.replace(FOOTER_MARKER_HTML, img_tags + FOOTER_MARKER_HTML, 1)
-
-    # Si no hay footer todavía, inserta antes de </body> o al final
-    if re.search(r"</body>", html, re.IGNORECASE):
-        return re.sub(r"(</body>)", rf"{img_tags}\1", html, flags=re.IGNORECASE, count=1)
-    return html + img_tags
-
-
 def extract_inline_preferences(content_html: Optional[str]) -> tuple[Optional[str], bool, str]:
     """
     Lee preferencias en el HTML:
@@ -143,24 +287,48 @@ def extract_inline_preferences(content_html: Optional[str]) -> tuple[Optional[st
     - <!-- PREF:IMG_SIZE:... -->   => ancho de imagen
     Devuelve (html_sin_marcadores, inline_images, img_width)
     """
-    inline_images = False
-    img_width = "100%"
+    # Filtro barato: sin "PREF:" no hay marcadores y se evita la regex
+    if not content_html or "PREF:" not in content_html:
+        return content_html, False, "100%"
+
+    prefs = {"inline_images": False, "img_width": None}
 
-    if not content_html:
-        return content_html, inline_images, img_width
+    def _strip_pref(match: re.Match) -> str:
+        if match.group(1):
+            prefs["inline_images"] = True
+        elif prefs["img_width"] is None:
+            prefs["img_width"] = match.group(2).strip()
+        return ""
 
-    html = content_html
+    # Un único recorrido: elimina todos los marcadores PREF y recoge sus valores
+    html = _PREF_RE.sub(_strip_pref, content_html)
 
-    if "<!-- PREF:INLINE_IMAGES -->" in html:
-        inline_images = True
-        html = html.replace("<!-- PREF:INLINE_IMAGES -->", "")
+    return html, prefs["inline_images"], prefs["img_width"] or "100%"
 
-    size_match = re.search(r"<!--\s*PREF:IMG_SIZE:(.*?)\s*-->", html)
-    if size_match:
-        img_width = size_match.group(1).strip()
-        html = html.replace(size_match.group(0), "")
 
-    return html, inline_images, img_width
+def assemble_html(content_text: str, content_html: Optional[str], img_tags: str = "") -> str:
+    """
+    Construye el HTML final en una sola pasada: HTML base, imágenes inline
+    (antes del marcador del footer o de </body>) y footer si aún no existe.
+    """
+    html = ensure_html_string(content_text, content_html)
+
+    marker = html.find(FOOTER_MARKER_HTML)
+    if marker != -1:
+        if not img_tags:
+            return html
+        return "".join([html[:marker], img_tags, html[marker:]])
+
+    tail = img_tags if FOOTER_MARKER_TEXT in html else img_tags + EMAIL_FOOTER
+    if not tail:
+        return html
+
+    # Filtro barato: sin "</" no puede haber </body> y se evita la regex
+    body_close = _BODY_CLOSE_RE.search(html) if "</" in html else None
+    if body_close:
+        pos = body_close.start()
+        return "".join([html[:pos], tail, html[pos:]])
+    return html + tail
 
 
 # --------------------------------------------------------------------
@@ -203,48 +371,138 @@ def markdown_to_html(text: str) -> str:
     return '\n'.join(html_blocks)
 
 
+# Bloques múltiplo de 3 para que cada trozo codificado no lleve relleno '='
+_B64_CHUNK_SIZE = 57 * 1024
+_FILE_BUFFER_SIZE = 1024 * 1024
+
+# Extensión -> (content_type, es_imagen)
+_CONTENT_TYPES = {
+    ".jpg": ("image/jpeg", True),
+    ".jpeg": ("image/jpeg", True),
+    ".png": ("image/png", True),
+    ".gif": ("image/gif", True),
+    ".pdf": ("application/pdf", False),
+}
+_DEFAULT_CONTENT_TYPE = ("application/octet-stream", False)
+
+# Por encima de este tamaño Graph no acepta el adjunto en línea (base64 en el
+# JSON); se sube con una sesión de carga sobre un borrador.
+LARGE_ATTACHMENT_THRESHOLD = 3_000_000
+# Trozos de subida: múltiplo de 320 KiB y por debajo del límite de 4 MB por petición
+_UPLOAD_CHUNK_SIZE = 12 * 320 * 1024
+
+
+# Caché de base64 por (ruta, tamaño, mtime), acotada por bytes y no por número
+# de entradas: cada valor puede ocupar varios MB
+_B64_CACHE_MAX_BYTES = 32 * 1024 * 1024
+_B64_CACHE: "OrderedDict[tuple, str]" = OrderedDict()
+_B64_CACHE_BYTES = 0
+_B64_CACHE_LOCK = threading.Lock()
+
+
+def _read_file_base64(filepath: str, size: int) -> str:
+    """Codifica un fichero en base64 leyendo por bloques sobre un buffer pre-dimensionado."""
+    buf = bytearray(((size + 2) // 3) * 4)
+    pos = 0
+    with open(filepath, "rb", buffering=_FILE_BUFFER_SIZE) as f:
+        for chunk in iter(lambda: f.read(_B64_CHUNK_SIZE), b""):
+            encoded = binascii.b2a_base64(chunk, newline=False)
+            buf[pos:pos + len(encoded)] = encoded
+            pos += len(encoded)
+    # Recorte in situ (no-op si el tamaño coincide) en lugar de copiar con buf[:pos]
+    del buf[pos:]
+    return buf.decode("ascii")
+
+
+def _encode_file_base64(filepath: str, size: int, mtime: float) -> str:
+    """
+    Devuelve el base64 del fichero, reutilizándolo si ya se codificó.
+    size y mtime forman parte de la clave: si el fichero cambia, se recodifica.
+    """
+    global _B64_CACHE_BYTES
+    key = (filepath, size, mtime)
+    with _B64_CACHE_LOCK:
+        cached = _B64_CACHE.get(key)
+        if cached is not None:
+            _B64_CACHE.move_to_end(key)
+            return cached
+
+    encoded = _read_file_base64(filepath, size)
+
+    if len(encoded) <= _B64_CACHE_MAX_BYTES:
+        with _B64_CACHE_LOCK:
+            if key not in _B64_CACHE:
+                _B64_CACHE[key] = encoded
+                _B64_CACHE_BYTES += len(encoded)
+                while _B64_CACHE_BYTES > _B64_CACHE_MAX_BYTES:
+                    _, evicted = _B64_CACHE.popitem(last=False)
+                    _B64_CACHE_BYTES -= len(evicted)
+    return encoded
+
+
+def _try_encode_file(file_info: tuple):
+    """Codifica (ruta, tamaño, mtime); devuelve la excepción en lugar de lanzarla
+    para que un fichero ilegible no aborte el resto en el pool."""
+    try:
+        return _encode_file_base64(*file_info)
+    except Exception as e:
+        return e
+
+
 def build_attachments_payload(
     attachments: Optional[List[str]],
     inline_images: bool,
     img_width: str
-) -> tuple[list, str]:
+) -> tuple[list, str, list]:
     """
     Prepara payload de adjuntos para Graph y, si inline_images=True,
     genera etiquetas <img src="cid:..."> para insertar en el HTML.
+    Los ficheros mayores de LARGE_ATTACHMENT_THRESHOLD no se codifican: se
+    devuelven aparte como (ruta, nombre, content_type, tamaño) para subirlos
+    con una sesión de carga.
+    Los CIDs se generan en cada llamada; solo el base64 de cada fichero se reutiliza.
     """
-    processed_attachments = []
-    img_tags_to_add = ""
-
     if not attachments:
-        return processed_attachments, img_tags_to_add
-
-    print(f"📎 Procesando {len(attachments)} adjuntos (Inline: {inline_images})...")
+        return [], "", []
 
+    # Un único stat por fichero: existencia, tamaño y mtime (clave de caché)
+    files = []
     for filepath in attachments:
-        if not os.path.exists(filepath):
-            print(f"❌ Archivo no encontrado: {filepath}")
+        try:
+            st = os.stat(filepath)
+        except FileNotFoundError:
+            logger.error("❌ Archivo no encontrado: %s", filepath)
             continue
+        files.append((filepath, st.st_size, st.st_mtime))
 
-        try:
-            with open(filepath, "rb") as f:
-                content = base64.b64encode(f.read()).decode("utf-8")
+    processed_attachments = []
+    img_tags_parts = []
+    large_attachments = []
+
+    logger.info("📎 Procesando %d adjuntos (Inline: %s)...", len(files), inline_images)
+
+    # Codificación base64 en paralelo (b2a_base64 libera el GIL); map conserva el orden
+    to_encode = [f for f in files if f[1] <= LARGE_ATTACHMENT_THRESHOLD]
+    if len(to_encode) > 1:
+        with ThreadPoolExecutor(max_workers=min(len(to_encode), os.cpu_count() or 1)) as executor:
+            encoded = dict(zip(to_encode, executor.map(_try_encode_file, to_encode)))
+    else:
+        encoded = {f: _try_encode_file(f) for f in to_encode}
 
+    for filepath, size, mtime in files:
+        try:
             filename = os.path.basename(filepath)
-            ext = filename.lower()
-
-            content_type = "application/octet-stream"
-            is_image = False
-            if ext.endswith((".jpg", ".jpeg")):
-                content_type = "image/jpeg"
-                is_image = True
-            elif ext.endswith(".png"):
-                content_type = "image/png"
-                is_image = True
-            elif ext.endswith(".gif"):
-                content_type = "image/gif"
-                is_image = True
-            elif ext.endswith(".pdf"):
-                content_type = "application/pdf"
+            ext = os.path.splitext(filename)[1].lower()
+            content_type, is_image = _CONTENT_TYPES.get(ext, _DEFAULT_CONTENT_TYPE)
+
+            if size > LARGE_ATTACHMENT_THRESHOLD:
+                large_attachments.append((filepath, filename, content_type, size))
+                logger.info("✅ Adjunto grande (sesión de carga): %s (%d bytes)", filename, size)
+                continue
+
+            content = encoded[(filepath, size, mtime)]
+            if isinstance(content, Exception):
+                raise content
 
             attachment_payload = {
                 "@odata.type": "#microsoft.graph.fileAttachment",
@@ -257,20 +515,106 @@ def build_attachments_payload(
                 cid = str(uuid.uuid4())
                 attachment_payload["isInline"] = True
                 attachment_payload["contentId"] = cid
-                img_tags_to_add += (
+                img_tags_parts.append(
                     f'<br><img src="cid:{cid}" alt="{filename}" style="width:{img_width}; height:auto;"><br>'
                 )
-                print(f"✅ Imagen INLINE: {filename} (CID: {cid})")
+                logger.info("✅ Imagen INLINE: %s (CID: %s)", filename, cid)
             else:
                 attachment_payload["isInline"] = False
-                print(f"✅ Adjunto: {filename}")
+                logger.info("✅ Adjunto: %s", filename)
 
             processed_attachments.append(attachment_payload)
 
         except Exception as e:
-            print(f"❌ Error al procesar adjunto {filepath}: {e}")
+            logger.error("❌ Error al procesar adjunto %s: %s", filepath, e)
+
+    return processed_attachments, "".join(img_tags_parts), large_attachments
+
+
+def _json_field(response: requests.Response, field: str):
+    """Devuelve un campo del cuerpo JSON de la respuesta, o None si no está o no es JSON."""
+    try:
+        return response.json().get(field)
+    except (ValueError, AttributeError):
+        return None
 
-    return processed_attachments, img_tags_to_add
+
+def _delete_draft(base_url: str, message_id: str, headers: dict) -> None:
+    """Elimina un borrador que no llegó a enviarse; un fallo aquí solo se registra."""
+    try:
+        response = _SESSION.delete(f"{base_url}/{message_id}", headers=headers, timeout=GRAPH_TIMEOUT)
+        if response.status_code != 204:
+            logger.warning("No se pudo eliminar el borrador %s: HTTP %s", message_id, response.status_code)
+    except requests.exceptions.RequestException as e:
+        logger.warning("No se pudo eliminar el borrador %s: %s", message_id, e)
+
+
+def _send_with_upload_session(
+    sender_email: str,
+    headers: dict,
+    message: dict,
+    large_attachments: list
+) -> requests.Response:
+    """
+    Envía un mensaje con adjuntos grandes: crea un borrador, sube cada fichero
+    por trozos con createUploadSession y lo envía.
+    Devuelve la primera respuesta fallida o la respuesta final de /send (202).
+    """
+    base_url = f"https://graph.microsoft.com/v1.0/users/{sender_email}/messages"
+
+    response = _SESSION.post(base_url, data=_dumps(message), headers=headers, timeout=GRAPH_TIMEOUT)
+    if response.status_code != 201:
+        return response
+    message_id = _json_field(response, "id")
+    if not message_id:
+        return response
+
+    # Si no se llega a /send, el borrador (con adjuntos a medias) se elimina
+    sent = False
+    try:
+        for filepath, filename, content_type, size in large_attachments:
+            session_payload = {
+                "AttachmentItem": {
+                    "attachmentType": "file",
+                    "name": filename,
+                    "size": size,
+                    "contentType": content_type,
+                }
+            }
+            response = _SESSION.post(
+                f"{base_url}/{message_id}/attachments/createUploadSession",
+                data=_dumps(session_payload), headers=headers, timeout=GRAPH_TIMEOUT
+            )
+            if response.status_code != 201:
+                return response
+            upload_url = _json_field(response, "uploadUrl")
+            if not upload_url:
+                return response
+
+            # La URL de subida ya va autenticada: no se envía el token
+            start = 0
+            with open(filepath, "rb") as f:
+                for chunk in iter(lambda: f.read(_UPLOAD_CHUNK_SIZE), b""):
+                    end = start + len(chunk) - 1
+                    response = _SESSION.put(
+                        upload_url,
+                        data=chunk,
+                        headers={
+                            "Content-Type": "application/octet-stream",
+                            "Content-Range": f"bytes {start}-{end}/{size}",
+                        },
+                        timeout=GRAPH_TIMEOUT
+                    )
+                    if response.status_code not in (200, 201):
+                        return response
+                    start = end + 1
+
+        response = _SESSION.post(f"{base_url}/{message_id}/send", headers=headers, timeout=GRAPH_TIMEOUT)
+        sent = True
+        return response
+    finally:
+        if not sent:
+            _delete_draft(base_url, message_id, headers)
 
 
 # --------------------------------------------------------------------
@@ -293,32 +637,60 @@ def get_graph_config() -> Optional[dict]:
     }
 
 
+_GRAPH_SCOPES = ["https://graph.microsoft.com/.default"]
+# Margen para renovar el token antes de que caduque (segundos)
+_TOKEN_EXPIRY_MARGIN = 300
+
+_MSAL_LOCK = threading.Lock()
+_MSAL_APP = None
+_MSAL_APP_KEY = None
+_CACHED_TOKEN = None
+_CACHED_TOKEN_EXPIRES_ON = 0.0
+
+
 def get_access_token() -> Optional[str]:
+    """
+    Devuelve un token de aplicación para Graph reutilizando la misma instancia
+    de MSAL (y su caché en memoria) entre llamadas.
+    """
+    global _MSAL_APP, _MSAL_APP_KEY, _CACHED_TOKEN, _CACHED_TOKEN_EXPIRES_ON
+
     if ConfidentialClientApplication is None:
-        print("Error: msal no está instalado. Ejecuta: pip install msal")
+        logger.error("msal no está instalado. Ejecuta: pip install msal")
         return None
 
     config = get_graph_config()
     if not config:
-        print("Error: Configuración de Microsoft Graph incompleta.")
+        logger.error("Configuración de Microsoft Graph incompleta.")
         return None
 
-    authority = f"https://login.microsoftonline.com/{config['tenant_id']}"
-
-    app = ConfidentialClientApplication(
-        config["client_id"],
-        authority=authority,
-        client_credential=config["client_secret"]
+    app_key = (config["tenant_id"], config["client_id"], config["client_secret"])
+
+    with _MSAL_LOCK:
+        if _MSAL_APP is None or _MSAL_APP_KEY != app_key:
+            _MSAL_APP = ConfidentialClientApplication(
+                config["client_id"],
+                authority=f"https://login.microsoftonline.com/{config['tenant_id']}",
+                client_credential=config["client_secret"]
+            )
+            _MSAL_APP_KEY = app_key
+            _CACHED_TOKEN = None
+        elif _CACHED_TOKEN and time.time() < _CACHED_TOKEN_EXPIRES_ON:
+            return _CACHED_TOKEN
+
+        result = _MSAL_APP.acquire_token_silent(_GRAPH_SCOPES, account=None)
+        if not result:
+            result = _MSAL_APP.acquire_token_for_client(scopes=_GRAPH_SCOPES)
+
+        if "access_token" in result:
+            _CACHED_TOKEN = result["access_token"]
+            _CACHED_TOKEN_EXPIRES_ON = time.time() + int(result.get("expires_in", 0)) - _TOKEN_EXPIRY_MARGIN
+            return _CACHED_TOKEN
+
+    logger.error(
+        "Error obteniendo token: %s. Descripción: %s",
+        result.get('error', 'Unknown error'), result.get('error_description', '')
     )
-
-    scopes = ["https://graph.microsoft.com/.default"]
-    result = app.acquire_token_for_client(scopes=scopes)
-
-    if "access_token" in result:
-        return result["access_token"]
-
-    print(f"Error obteniendo token: {result.get('error', 'Unknown error')}")
-    print(f"Descripción: {result.get('error_description', '')}")
     return None
 
 
@@ -359,16 +731,14 @@ def send_mail_graph(
 ) -> bool:
     config = get_graph_config()
     if not config:
-        print("Error: Configuración de Microsoft Graph incompleta.")
-        print("Variables requeridas en .env:")
-        print("  MICROSOFT_CLIENT_ID")
-        print("  MICROSOFT_TENANT_ID")
-        print("  MICROSOFT_CLIENT_SECRET")
-        print("  MICROSOFT_SENDER_EMAIL")
+        logger.error(
+            "Configuración de Microsoft Graph incompleta. Variables requeridas en .env: "
+            "MICROSOFT_CLIENT_ID, MICROSOFT_TENANT_ID, MICROSOFT_CLIENT_SECRET, MICROSOFT_SENDER_EMAIL"
+        )
         return False
 
     if not receivers:
-        print("Advertencia: No hay destinatarios para enviar el correo.")
+        logger.warning("No hay destinatarios para enviar el correo.")
         return False
 
     access_token = get_access_token()
@@ -379,27 +749,22 @@ def send_mail_graph(
     content_html, pref_inline, img_width = extract_inline_preferences(content_html)
     if pref_inline:
         inline_images = True
-        print("✅ Preferencia inline_images detectada en HTML.")
-    if content_html:
-        print(f"✅ Preferencia de tamaño de imagen: {img_width}")
-
-    # HTML base
-    html = ensure_html_string(content_text, content_html)
+        logger.info("✅ Preferencia inline_images detectada en HTML.")
+    if inline_images:
+        logger.info("✅ Preferencia de tamaño de imagen: %s", img_width)
 
     # Adjuntos + imágenes inline
-    processed_attachments, img_tags_to_add = build_attachments_payload(
+    processed_attachments, img_tags_to_add, large_attachments = build_attachments_payload(
         attachments=attachments,
         inline_images=inline_images,
         img_width=img_width
     )
 
-    # Insertar imágenes inline antes del footer (por marcador) o al final
-    html = insert_inline_images_before_footer(html, img_tags_to_add)
-
-    # Asegurar footer una sola vez
-    html = ensure_footer_once(html)
+    # HTML final: base + imágenes inline antes del footer + footer una sola vez
+    html = assemble_html(content_text, content_html, img_tags_to_add)
 
-    print("🧪 FOOTER count:", html.count(FOOTER_MARKER_TEXT))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("🧪 FOOTER count: %d", html.count(FOOTER_MARKER_TEXT))
 
     message = {
         "message": {
@@ -422,25 +787,27 @@ def send_mail_graph(
     headers = {"Authorization": f"Bearer {access_token}", "Content-Type": "application/json"}
 
     try:
-        response = requests.post(endpoint, json=message, headers=headers)
+        if large_attachments:
+            response = _send_with_upload_session(sender_email, headers, message["message"], large_attachments)
+        else:
+            response = _SESSION.post(endpoint, data=_dumps(message), headers=headers, timeout=GRAPH_TIMEOUT)
         if response.status_code == 202:
-            print(f"Correo enviado exitosamente via Graph API a: {', '.join(receivers)}")
+            logger.info("Correo enviado exitosamente via Graph API a: %s", ", ".join(receivers))
             return True
 
-        print(f"Error al enviar correo: {response.status_code}")
-        print(f"Respuesta: {response.text}")
+        logger.error("Error al enviar correo: %s. Respuesta: %s", response.status_code, response.text)
 
         if response.status_code == 401:
-            print("\nPosible solución: Verifica que el Client Secret no haya expirado.")
+            logger.error("Posible solución: Verifica que el Client Secret no haya expirado.")
         elif response.status_code == 403:
-            print("\nPosible solución: Verifica que la app tenga el permiso 'Mail.Send' (APLICACIÓN) en Azure.")
+            logger.error("Posible solución: Verifica que la app tenga el permiso 'Mail.Send' (APLICACIÓN) en Azure.")
         elif response.status_code == 404:
-            print(f"\nPosible solución: Verifica que el email '{sender_email}' exista y sea válido.")
+            logger.error("Posible solución: Verifica que el email '%s' exista y sea válido.", sender_email)
 
         return False
 
     except requests.exceptions.RequestException as e:
-        print(f"Error de conexión: {e}")
+        logger.error("Error de conexión: %s", e)
         return False
 
 
@@ -455,8 +822,11 @@ def send_mail_graph_bulk(
     attachments: Optional[List[str]] = None,
     inline_images: bool = False,
     progress_callback=None,
-    delay_between_emails: float = 2.0
+    delay_between_emails: float = 2.0,
+    max_workers: int = BULK_MAX_WORKERS
 ) -> dict:
+    # delay_between_emails se mantiene por compatibilidad: el ritmo lo marcan
+    # ahora el pool de hilos y los reintentos de la sesión ante 429/503.
     if not receivers:
         return {'total': 0, 'successful': 0, 'failed': 0, 'successful_emails': [], 'failed_emails': []}
 
@@ -480,34 +850,23 @@ def send_mail_graph_bulk(
             'failed_emails': [{'email': e, 'error': 'No se pudo obtener token de acceso'} for e in receivers]
         }
 
-    # Log BD (opcional)
-    send_log_id = None
-    if create_email_send_log:
-        try:
-            send_log_id = create_email_send_log(platform='Gmail', subject=subject, total_recipients=len(receivers))
-        except Exception as e:
-            print(f"⚠️ No se pudo crear log en BD: {e}")
-
     # Preferencias HTML
     content_html, pref_inline, img_width = extract_inline_preferences(content_html)
     if pref_inline:
         inline_images = True
 
-    # HTML base
-    html = ensure_html_string(content_text, content_html)
-
     # Adjuntos (una vez) + imágenes inline
-    processed_attachments, img_tags_to_add = build_attachments_payload(
+    processed_attachments, img_tags_to_add, large_attachments = build_attachments_payload(
         attachments=attachments,
         inline_images=inline_images,
         img_width=img_width
     )
 
-    # Insertar imágenes y footer (una vez) para TODOS
-    html = insert_inline_images_before_footer(html, img_tags_to_add)
-    html = ensure_footer_once(html)
+    # HTML final con imágenes y footer (una vez) para TODOS
+    html = assemble_html(content_text, content_html, img_tags_to_add)
 
-    print("🧪 FOOTER count:", html.count(FOOTER_MARKER_TEXT))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("🧪 FOOTER count: %d", html.count(FOOTER_MARKER_TEXT))
 
     sender_email = config["sender_email"]
     endpoint = f"https://graph.microsoft.com/v1.0/users/{sender_email}/sendMail"
@@ -518,69 +877,87 @@ def send_mail_graph_bulk(
 
     total = len(receivers)
 
-    for idx, receiver_email in enumerate(receivers, 1):
-        if progress_callback:
-            progress_callback(idx, total, receiver_email)
-
-        message = {
-            "message": {
-                "subject": subject,
-                "body": {"contentType": "HTML", "content": html},
-                "toRecipients": [{"emailAddress": {"address": receiver_email}}]
-            },
-            "saveToSentItems": "true"
-        }
+    # Cuerpo invariante serializado una sola vez con un marcador en toRecipients;
+    # por destinatario solo se serializa y sustituye la lista de destinatarios.
+    recipients_marker = f"__RECIPIENTS_{uuid.uuid4().hex}__"
+    base_message = {
+        "message": {
+            "subject": subject,
+            "body": {"contentType": "HTML", "content": html},
+            "toRecipients": recipients_marker
+        },
+        "saveToSentItems": "true"
+    }
+    if processed_attachments:
+        base_message["message"]["attachments"] = processed_attachments
 
-        if processed_attachments:
-            message["message"]["attachments"] = processed_attachments
+    recipients_marker_json = _dumps(recipients_marker)
+    body_template = None if large_attachments else _dumps(base_message)
 
-        try:
-            response = requests.post(endpoint, json=message, headers=headers)
-            if response.status_code == 202:
-                successful_emails.append(receiver_email)
-                print(f"✅ [{idx}/{total}] Enviado a: {receiver_email}")
-
-                if send_log_id and add_email_send_result:
-                    try:
-                        add_email_send_result(send_log_id=send_log_id, recipient_email=receiver_email, success=True)
-                    except Exception as e:
-                        print(f"⚠️ No se pudo registrar éxito en BD: {e}")
-            else:
-                error_msg = f"HTTP {response.status_code}: {response.text[:200]}"
-                failed_emails.append({'email': receiver_email, 'error': error_msg})
-                print(f"❌ [{idx}/{total}] Error: {receiver_email} - {error_msg}")
-
-                if send_log_id and add_email_send_result:
-                    try:
-                        add_email_send_result(
-                            send_log_id=send_log_id,
-                            recipient_email=receiver_email,
-                            success=False,
+    def _send_one(receiver_email: str):
+        recipients = [{"emailAddress": {"address": receiver_email}}]
+
+        _throttle()
+        if large_attachments:
+            message = dict(base_message["message"], toRecipients=recipients)
+            return _send_with_upload_session(sender_email, headers, message, large_attachments)
+
+        payload = body_template.replace(recipients_marker_json, _dumps(recipients), 1)
+        return _SESSION.post(endpoint, data=payload, headers=headers, timeout=GRAPH_TIMEOUT)
+
+    # Log BD (opcional)
+    send_log_id, results_queue, results_writer = _open_send_log(subject, len(receivers))
+
+    # El hilo escritor y el log se cierran siempre, aunque el envío falle
+    try:
+        # Los POST se lanzan en paralelo; el progreso y el registro en BD se
+        # procesan en este hilo según van terminando.
+        with ThreadPoolExecutor(max_workers=min(max_workers, total)) as executor:
+            futures = {executor.submit(_send_one, email): email for email in receivers}
+
+            for idx, future in enumerate(as_completed(futures), 1):
+                receiver_email = futures[future]
+                if progress_callback:
+                    progress_callback(idx, total, receiver_email)
+
+                try:
+                    response = future.result()
+                    if response.status_code == 202:
+                        successful_emails.append(receiver_email)
+                        logger.debug("✅ [%d/%d] Enviado a: %s", idx, total, receiver_email)
+                        _queue_result(results_queue, receiver_email, True)
+                    else:
+                        error_msg = f"HTTP {response.status_code}: {response.text[:200]}"
+                        failed_emails.append({'email': receiver_email, 'error': error_msg})
+                        logger.warning("❌ [%d/%d] Error: %s - %s", idx, total, receiver_email, error_msg)
+                        _queue_result(
+                            results_queue, receiver_email, False,
                             error_code=f"HTTP {response.status_code}",
                             error_message=response.text[:500]
                         )
-                    except Exception as e:
-                        print(f"⚠️ No se pudo registrar fallo en BD: {e}")
-
-        except requests.exceptions.RequestException as e:
-            error_msg = f"Error de conexión: {e}"
-            failed_emails.append({'email': receiver_email, 'error': error_msg})
-            print(f"❌ [{idx}/{total}] {receiver_email} - {error_msg}")
 
-            if send_log_id and add_email_send_result:
-                try:
-                    add_email_send_result(
-                        send_log_id=send_log_id,
-                        recipient_email=receiver_email,
-                        success=False,
+                except requests.exceptions.RequestException as e:
+                    error_msg = f"Error de conexión: {e}"
+                    failed_emails.append({'email': receiver_email, 'error': error_msg})
+                    logger.warning("❌ [%d/%d] %s - %s", idx, total, receiver_email, error_msg)
+                    _queue_result(
+                        results_queue, receiver_email, False,
                         error_code="CONNECTION_ERROR",
                         error_message=str(e)[:500]
                     )
-                except Exception as ex:
-                    print(f"⚠️ No se pudo registrar error en BD: {ex}")
-
-        if idx < total:
-            time.sleep(delay_between_emails)
+                except Exception as e:
+                    # Cualquier otro fallo se registra para este destinatario sin abortar el resto
+                    error_msg = f"Error inesperado: {e}"
+                    failed_emails.append({'email': receiver_email, 'error': error_msg})
+                    logger.exception("❌ [%d/%d] %s - %s", idx, total, receiver_email, error_msg)
+                    _queue_result(
+                        results_queue, receiver_email, False,
+                        error_code="SEND_ERROR",
+                        error_message=str(e)[:500]
+                    )
+    finally:
+        _finish_send_log(send_log_id, results_queue, results_writer,
+                         len(successful_emails), len(failed_emails))
 
     result = {
         'total': total,
@@ -589,15 +966,7 @@ def send_mail_graph_bulk(
         'successful_emails': successful_emails,
         'failed_emails': failed_emails
     }
-
-    if send_log_id and complete_email_send_log:
-        try:
-            complete_email_send_log(send_log_id=send_log_id,
-                                   successful_count=result['successful'],
-                                   failed_count=result['failed'])
-        except Exception as e:
-            print(f"⚠️ No se pudo completar log en BD: {e}")
-
+    logger.info("Envío completado: %d/%d exitosos, %d fallidos", result['successful'], total, result['failed'])
     return result
 
 
@@ -646,29 +1015,7 @@ def send_mail_graph_batch(
             valid_receivers.append(email)
         else:
             pre_failed.append({'email': email, 'error': err})
-            print(f"❌ Dominio inválido: {email} — {err}")
-
-    # Log BD (opcional) — total incluye los pre-fallidos
-    send_log_id = None
-    if create_email_send_log:
-        try:
-            send_log_id = create_email_send_log(platform='Gmail', subject=subject, total_recipients=len(receivers))
-        except Exception as e:
-            print(f"⚠️ No se pudo crear log en BD: {e}")
-
-    # Registrar los pre-fallidos (dominio inválido) en BD
-    if send_log_id and add_email_send_result:
-        for pf in pre_failed:
-            try:
-                add_email_send_result(
-                    send_log_id=send_log_id,
-                    recipient_email=pf['email'],
-                    success=False,
-                    error_code='INVALID_DOMAIN',
-                    error_message=pf['error']
-                )
-            except Exception as e:
-                print(f"⚠️ No se pudo registrar dominio inválido en BD: {e}")
+            logger.warning("❌ Dominio inválido: %s — %s", email, err)
 
     # Si no quedan correos válidos, devolver resultado directamente
     if not valid_receivers:
@@ -679,11 +1026,8 @@ def send_mail_graph_batch(
             'successful_emails': [],
             'failed_emails': pre_failed
         }
-        if send_log_id and complete_email_send_log:
-            try:
-                complete_email_send_log(send_log_id=send_log_id, successful_count=0, failed_count=len(pre_failed))
-            except Exception:
-                pass
+        send_log_id, results_queue, results_writer = _open_send_log(subject, len(receivers), pre_failed)
+        _finish_send_log(send_log_id, results_queue, results_writer, 0, len(pre_failed))
         return result
 
     # Preferencias HTML
@@ -691,116 +1035,203 @@ def send_mail_graph_batch(
     if pref_inline:
         inline_images = True
 
-    # HTML base
-    html = ensure_html_string(content_text, content_html)
-
     # Adjuntos (una vez) + imágenes inline
-    processed_attachments, img_tags_to_add = build_attachments_payload(
+    processed_attachments, img_tags_to_add, large_attachments = build_attachments_payload(
         attachments=attachments,
         inline_images=inline_images,
         img_width=img_width
     )
 
-    # Insertar imágenes y footer (una vez) para TODOS
-    html = insert_inline_images_before_footer(html, img_tags_to_add)
-    html = ensure_footer_once(html)
+    # HTML final con imágenes y footer (una vez) para TODOS
+    html = assemble_html(content_text, content_html, img_tags_to_add)
 
-    print("🧪 FOOTER count:", html.count(FOOTER_MARKER_TEXT))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("🧪 FOOTER count: %d", html.count(FOOTER_MARKER_TEXT))
 
     sender_email = config["sender_email"]
     batch_endpoint = "https://graph.microsoft.com/v1.0/$batch"
     headers = {"Authorization": f"Bearer {access_token}", "Content-Type": "application/json"}
 
     total = len(receivers)
-    successful_emails = []
-    failed_emails = list(pre_failed)  # incluir los pre-fallidos por dominio inválido
-
     valid_total = len(valid_receivers)
-    batches_needed = (valid_total + batch_size - 1) // batch_size
-    email_index = 0
-
-    for batch_num in range(batches_needed):
-        batch_start = batch_num * batch_size
-        batch_end = min(batch_start + batch_size, valid_total)
-        batch_receivers = valid_receivers[batch_start:batch_end]
-
-        batch_requests = []
-        for i, receiver_email in enumerate(batch_receivers):
-            email_index += 1
-            if progress_callback:
-                progress_callback(email_index, total, receiver_email)
-
-            message = {
-                "message": {
-                    "subject": subject,
-                    "body": {"contentType": "HTML", "content": html},
-                    "toRecipients": [{"emailAddress": {"address": receiver_email}}]
-                },
-                "saveToSentItems": "true"
-            }
+    # Resultado por índice de valid_receivers: (status_code, error_msg)
+    outcomes = [None] * valid_total
+
+    # Parte común del mensaje (cuerpo y adjuntos) construida una sola vez;
+    # cada destinatario recibe una copia superficial que la comparte por referencia.
+    base_message = {
+        "subject": subject,
+        "body": {"contentType": "HTML", "content": html},
+    }
 
-            if processed_attachments:
-                message["message"]["attachments"] = processed_attachments
+    # Los adjuntos se serializan una única vez y se insertan en el JSON de cada
+    # batch sustituyendo un marcador, en lugar de re-serializarlos por destinatario.
+    attachments_marker = f"__ATTACHMENTS_{uuid.uuid4().hex}__"
+    attachments_marker_json = _dumps(attachments_marker)
+    attachments_json = None
+    if processed_attachments and large_attachments:
+        base_message["attachments"] = processed_attachments
+    elif processed_attachments:
+        attachments_json = _dumps(processed_attachments)
+        base_message["attachments"] = attachments_marker
+
+    def _encode_batch(batch_requests: list) -> bytes:
+        payload = _dumps({"requests": batch_requests})
+        if attachments_json:
+            payload = payload.replace(attachments_marker_json, attachments_json)
+        return payload
+
+    send_url = f"/users/{sender_email}/sendMail"
+    sub_headers = {"Content-Type": "application/json"}
+
+    # Construir todas las sub-peticiones de antemano; el id es el índice en valid_receivers
+    sub_requests = []
+    for i, receiver_email in enumerate(valid_receivers):
+        message = base_message.copy()
+        message["toRecipients"] = [{"emailAddress": {"address": receiver_email}}]
+
+        sub_requests.append({
+            "id": str(i),
+            "method": "POST",
+            "url": send_url,
+            "body": {"message": message, "saveToSentItems": "true"},
+            "headers": sub_headers
+        })
+
+    batches = [sub_requests[i:i + batch_size] for i in range(0, len(sub_requests), batch_size)]
+    batches_needed = len(batches)
+
+    def _send_batch(batch_num: int, batch_requests: list) -> list:
+        """Envía un batch y reencola las sub-peticiones con 429.
+
+        Devuelve una lista de tuplas (índice, status, mensaje de error).
+        """
+        outcomes = []
+        pending = batch_requests
+        attempt = 0
+        while pending:
+            logger.info("📦 Enviando batch %d/%d (%d correos)...", batch_num + 1, batches_needed, len(pending))
+            _throttle(len(pending))
+            try:
+                response = _SESSION.post(
+                    batch_endpoint, data=_encode_batch(pending), headers=headers, timeout=GRAPH_TIMEOUT
+                )
+            except requests.exceptions.RequestException as e:
+                error_msg = f"Error de conexión en batch: {e}"
+                logger.error("❌ %s", error_msg)
+                return outcomes + [(int(r["id"]), None, error_msg) for r in pending]
 
-            batch_requests.append({
-                "id": str(batch_start + i),
-                "method": "POST",
-                "url": f"/users/{sender_email}/sendMail",
-                "body": message,
-                "headers": {"Content-Type": "application/json"}
-            })
+            if response.status_code != 200:
+                error_msg = f"Batch falló: HTTP {response.status_code} - {response.text[:200]}"
+                logger.error("❌ %s", error_msg)
+                return outcomes + [(int(r["id"]), None, error_msg) for r in pending]
+
+            by_id = {r["id"]: r for r in pending}
+            throttled = []
+            retry_after = 1
+            for resp in response.json().get("responses", []):
+                status_code = resp.get("status", 500)
+                if status_code == 429 and attempt < BATCH_MAX_RETRIES:
+                    throttled.append(by_id[resp["id"]])
+                    resp_headers = resp.get("headers") or {}
+                    retry_after = max(retry_after, int(resp_headers.get("Retry-After", 1)))
+                    continue
+                error_msg = None
+                if status_code != 202:
+                    error_body = resp.get("body") or {}
+                    error_msg = error_body.get("error", {}).get("message", f"HTTP {status_code}")
+                outcomes.append((int(resp["id"]), status_code, error_msg))
+
+            pending = throttled
+            if pending:
+                attempt += 1
+                logger.info(
+                    "⏳ Batch %d: %d correos limitados (429), reintentando en %ss",
+                    batch_num + 1, len(pending), retry_after
+                )
+                time.sleep(retry_after)
+
+        return outcomes
+
+    def _send_individually(batch_num: int, batch_requests: list) -> list:
+        """$batch no admite sesiones de carga: con adjuntos grandes cada correo
+        se envía por separado (borrador + subida + envío)."""
+        logger.info(
+            "📦 Enviando grupo %d/%d (%d correos con adjuntos grandes)...",
+            batch_num + 1, batches_needed, len(batch_requests)
+        )
+        outcomes = []
+        for r in batch_requests:
+            _throttle()
+            try:
+                response = _send_with_upload_session(
+                    sender_email, headers, r["body"]["message"], large_attachments
+                )
+            except requests.exceptions.RequestException as e:
+                outcomes.append((int(r["id"]), None, f"Error de conexión: {e}"))
+                continue
+            error_msg = None
+            if response.status_code != 202:
+                error_msg = f"HTTP {response.status_code}: {response.text[:200]}"
+            outcomes.append((int(r["id"]), response.status_code, error_msg))
+        return outcomes
 
-        batch_payload = {"requests": batch_requests}
+    send_group = _send_individually if large_attachments else _send_batch
 
-        try:
-            print(f"📦 Enviando batch {batch_num + 1}/{batches_needed} ({len(batch_receivers)} correos)...")
-            response = requests.post(batch_endpoint, json=batch_payload, headers=headers)
+    # Log BD (opcional) — total incluye los pre-fallidos
+    send_log_id, results_queue, results_writer = _open_send_log(subject, len(receivers), pre_failed)
 
-            if response.status_code == 200:
-                batch_response = response.json()
+    # El hilo escritor y el log se cierran siempre, aunque el envío falle
+    try:
+        # Los batches se envían en paralelo; el progreso y el registro en BD se
+        # procesan en este hilo según van terminando.
+        email_index = len(pre_failed)
+        with ThreadPoolExecutor(max_workers=min(BATCH_MAX_WORKERS, batches_needed)) as executor:
+            futures = {executor.submit(send_group, n, b): b for n, b in enumerate(batches)}
+
+            for future in as_completed(futures):
+                try:
+                    group_outcomes = future.result()
+                except Exception as e:
+                    # Un fallo inesperado marca como fallidos los correos de ese grupo, no aborta el resto
+                    error_msg = f"Error inesperado: {e}"
+                    logger.exception("❌ %s", error_msg)
+                    group_outcomes = [(int(r["id"]), None, error_msg) for r in futures[future]]
+                    for r in futures[future]:
+                        _queue_result(
+                            results_queue, valid_receivers[int(r["id"])], False,
+                            error_code="SEND_ERROR", error_message=error_msg[:500]
+                        )
 
-                for resp in batch_response.get("responses", []):
-                    request_id = int(resp["id"])
+                for request_id, status_code, error_msg in group_outcomes:
                     receiver_email = valid_receivers[request_id]
-                    status_code = resp.get("status", 500)
+                    outcomes[request_id] = (status_code, error_msg)
+                    email_index += 1
+                    if progress_callback:
+                        progress_callback(email_index, total, receiver_email)
 
                     if status_code == 202:
-                        successful_emails.append(receiver_email)
-                        if send_log_id and add_email_send_result:
-                            try:
-                                add_email_send_result(send_log_id=send_log_id, recipient_email=receiver_email, success=True)
-                            except Exception as e:
-                                print(f"⚠️ No se pudo registrar éxito en BD: {e}")
-                    else:
-                        error_body = resp.get("body", {})
-                        error_msg = error_body.get("error", {}).get("message", f"HTTP {status_code}")
-                        failed_emails.append({"email": receiver_email, "error": error_msg})
-
-                        if send_log_id and add_email_send_result:
-                            try:
-                                add_email_send_result(
-                                    send_log_id=send_log_id,
-                                    recipient_email=receiver_email,
-                                    success=False,
-                                    error_code=f"HTTP {status_code}",
-                                    error_message=str(error_msg)[:500]
-                                )
-                            except Exception as e:
-                                print(f"⚠️ No se pudo registrar fallo en BD: {e}")
-            else:
-                error_msg = f"Batch falló: HTTP {response.status_code} - {response.text[:200]}"
-                print(f"❌ {error_msg}")
-                for receiver_email in batch_receivers:
-                    failed_emails.append({"email": receiver_email, "error": error_msg})
-
-        except requests.exceptions.RequestException as e:
-            error_msg = f"Error de conexión en batch: {e}"
-            print(f"❌ {error_msg}")
-            for receiver_email in batch_receivers:
-                failed_emails.append({"email": receiver_email, "error": error_msg})
-
-        if batch_num < batches_needed - 1:
-            time.sleep(0.5)
+                        _queue_result(results_queue, receiver_email, True)
+                    elif status_code is not None:
+                        _queue_result(
+                            results_queue, receiver_email, False,
+                            error_code=f"HTTP {status_code}",
+                            error_message=str(error_msg)[:500]
+                        )
+    finally:
+        successful_count = sum(1 for outcome in outcomes if outcome and outcome[0] == 202)
+        _finish_send_log(send_log_id, results_queue, results_writer,
+                         successful_count, total - successful_count)
+
+    # Listas finales en el orden original de destinatarios (incluidos los pre-fallidos)
+    successful_emails = [
+        email for email, outcome in zip(valid_receivers, outcomes) if outcome and outcome[0] == 202
+    ]
+    failed_emails = pre_failed + [
+        {"email": email, "error": outcome[1] if outcome else "Sin respuesta en el batch"}
+        for email, outcome in zip(valid_receivers, outcomes)
+        if not outcome or outcome[0] != 202
+    ]
 
     result = {
         'total': total,
@@ -809,15 +1240,7 @@ def send_mail_graph_batch(
         'successful_emails': successful_emails,
         'failed_emails': failed_emails
     }
-
-    if send_log_id and complete_email_send_log:
-        try:
-            complete_email_send_log(send_log_id=send_log_id,
-                                   successful_count=result['successful'],
-                                   failed_count=result['failed'])
-        except Exception as e:
-            print(f"⚠️ No se pudo completar log en BD: {e}")
-
+    logger.info("Envío completado: %d/%d exitosos, %d fallidos", result['successful'], total, result['failed'])
     return result
 
 
@@ -857,12 +1280,12 @@ def fetch_ndr_bounces(since_hours: int = 48) -> list:
     )
 
     try:
-        response = requests.get(url, headers=headers)
+        response = _SESSION.get(url, headers=headers, timeout=GRAPH_TIMEOUT)
         if response.status_code != 200:
-            print(f"⚠️ fetch_ndr_bounces: HTTP {response.status_code} — {response.text[:200]}")
+            logger.warning("⚠️ fetch_ndr_bounces: HTTP %s — %s", response.status_code, response.text[:200])
             return []
     except Exception as e:
-        print(f"⚠️ fetch_ndr_bounces: error de conexión — {e}")
+        logger.warning("⚠️ fetch_ndr_bounces: error de conexión — %s", e)
         return []
 
     messages = response.json().get("value", [])
@@ -908,7 +1331,7 @@ def fetch_ndr_bounces(since_hours: int = 48) -> list:
                 'received_at': received_at,
                 'ndr_subject': subject,
             })
-            print(f"📨 NDR detectado: {failed_email} — '{original_subject}'")
+            logger.info("📨 NDR detectado: %s — '%s'", failed_email, original_subject)
 
     return bounces
 
@@ -1,14 +1,352 @@
 import os
+import hashlib
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 from dotenv import load_dotenv
 import logging
+import numpy as np
 import pandas as pd
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 # Logger
 logger = logging.getLogger(__name__)
 
+# Máximo de imágenes de un carrusel que se registran y suben a la vez
+IMAGE_UPLOAD_WORKERS = 5
+
+# Por debajo de este tamaño el fichero se sube desde memoria en lugar de en streaming
+SMALL_UPLOAD_BYTES = 256 * 1024
+
+# organizationalEntityShareStatistics acepta como máximo 20 shares por petición
+SHARE_STATS_BATCH_SIZE = 20
+POST_METRICS_WORKERS = 8
+
+# Timeout (conexión, lectura) de cada llamada a la API de LinkedIn
+LINKEDIN_TIMEOUT = (5, 30)
+
+# Diccionario para traducir los URNs a nombres legibles
+_LABELS_MAP = {
+    "urn:li:seniority:1": "Sin experiencia", "urn:li:seniority:2": "En prácticas",
+    "urn:li:seniority:3": "Junior", "urn:li:seniority:4": "Associate",
+    "urn:li:seniority:5": "Senior", "urn:li:seniority:6": "Manager",
+    "urn:li:seniority:7": "Director", "urn:li:seniority:8": "VP",
+    "urn:li:seniority:9": "CXO", "urn:li:seniority:10": "Socio",
+    "urn:li:companySize:B": "1 empleado", "urn:li:companySize:C": "2-10 emp",
+    "urn:li:companySize:D": "11-50 emp", "urn:li:companySize:E": "51-200 emp",
+    "urn:li:companySize:F": "201-500 emp", "urn:li:companySize:G": "501-1000 emp",
+    "urn:li:companySize:H": "1001-5000 emp", "urn:li:companySize:I": "5001-10.000 emp",
+    "urn:li:companySize:J": "10.001+ emp",
+    "urn:li:geo:90009796": "Greater Orense Area",
+    "urn:li:geo:90009818": "Greater Vigo Metropolitan Area",
+    "urn:li:geo:90009790": "Greater Madrid Metropolitan Area",
+    "urn:li:geo:90009773": "Greater Ferrol Metropolitan Area",
+    "urn:li:geo:90009789": "Greater Lugo Metropolitan Area",
+    "urn:li:geo:90009761": "Greater Barcelona Metropolitan Area",
+    "urn:li:geo:90009795": "Greater Murcia Metropolitan Area",
+    "urn:li:geo:90009809": "Greater Santiago de Compostela Metropolitan Area",
+    "urn:li:geo:90009810": "Greater Sevilla Metropolitan Area",
+    "urn:li:geo:90009816": "Greater Valencia Metropolitan Area",
+    "urn:li:geo:90009776": "Greater Gijón Metropolitan Area",
+    "urn:li:geo:90009805": "Greater Salamanca Metropolitan Area",
+    "urn:li:geo:90009791": "Greater Málaga Metropolitan Area",
+    "urn:li:geo:90009787": "Greater Lerida Area",
+    "urn:li:geo:90009756": "Greater Alicante Area",
+    "urn:li:geo:90009830": "Cracow Metropolitan Area",
+    "urn:li:geo:90010133": "Bogotá D.C. Metropolitan Area",
+    "urn:li:geo:90009763": "Greater Bilbao Metropolitan Area",
+    "urn:li:geo:90009786": "Greater León, Spain Area",
+    "urn:li:geo:90009757": "Greater Almería Metropolitan Area",
+    "urn:li:geo:90009899": "Santiago Metropolitan Area",
+    "urn:li:geo:90010274": "Belgrade Metropolitan Area",
+    "urn:li:geo:90009770": "Greater Córdoba, Spain Area",
+    "urn:li:geo:90010142": "Medellín Metropolitan Area",
+    "urn:li:geo:90010352": "Lisbon Metropolitan Area",
+    "urn:li:geo:104332104": "Qingdao, Shandong, China",
+    "urn:li:geo:106486848": "Águilas, Región de Murcia, Spain",
+    "urn:li:geo:90010045": "Mexico City Metropolitan Area",
+    "urn:li:geo:90010354": "Porto Metropolitan Area",
+    "urn:li:geo:90009784": "Greater Jerez de la Frontera Metropolitan Area",
+    "urn:li:geo:90009792": "Greater Manresa Metropolitan Area",
+    "urn:li:geo:90009812": "Greater Tarragona Area",
+    "urn:li:geo:90009822": "Greater Zaragoza Metropolitan Area",
+    "urn:li:geo:90009936": "Greater Milan Metropolitan Area",
+    "urn:li:geo:90010414": "Grand Tunis Metropolitan Area",
+    "urn:li:geo:90009765": "Greater Cáceres Metropolitan Area",
+    "urn:li:geo:90009804": "Greater Sabadell Metropolitan Area",
+    "urn:li:geo:90009870": "Greater Buenos Aires",
+    "urn:li:geo:90009814": "Toledo, Spain Metropolitan Area",
+    "urn:li:geo:90009946": "Greater Pescara Metropolitan Area",
+    "urn:li:geo:90009797": "Greater Oviedo Metropolitan Area",
+    "urn:li:geo:90009753": "Greater La Coruña Area",
+    "urn:li:geo:90009778": "Greater Granada Metropolitan Area",
+    "urn:li:geo:90010421": "Greater Ankara",
+    "urn:li:geo:100238888": "Boiro, Galicia, Spain",
+    "urn:li:geo:90010261": "Doha Metropolitan Area",
+    "urn:li:geo:102007122": "Cairo, Egypt",
+    "urn:li:geo:90009735": "Greater Munich Metropolitan Area",
+    "urn:li:geo:104279445": "Miño, Galicia, Spain",
+    "urn:li:geo:101623594": "Popayán, Cauca, Colombia",
+    "urn:li:geo:90009949": "Greater Pordenone Metropolitan Area",
+    "urn:li:geo:107845132": "Požarevac, Centralna Srbija, Serbia",
+    "urn:li:geo:90010046": "Monterrey Metropolitan Area",
+    "urn:li:geo:101614633": "Soria, Castilla and Leon, Spain",
+    "urn:li:geo:101181680": "León, Castilla and Leon, Spain",
+    "urn:li:geo:102304121": "Negreira, Galicia, Spain",
+    "urn:li:geo:90009603": "Antwerp Metropolitan Area",
+    "urn:li:geo:105303313": "Órdenes, Galicia, Spain",
+    "urn:li:geo:103061829": "Santa Uxía, Galicia, Spain",
+    "urn:li:geo:90009871": "Cordoba, Argentina Metropolitan Area",
+    "urn:li:geo:90009794": "Greater Mataró Metropolitan Area",
+    "urn:li:geo:102344967": "Fuzhou, Fujian, China",
+    "urn:li:geo:90009894": "Greater Chillan Area",
+    "urn:li:geo:90009874": "Greater Rosario",
+    "urn:li:geo:101887839": "Geilenkirchen, North Rhine-Westphalia, Germany",
+    "urn:li:geo:102763519": "Outes, Galicia, Spain",
+    "urn:li:geo:104424298": "Athens, Georgia, United States",
+    "urn:li:geo:106181918": "Montalbán de Córdoba, Andalusia, Spain",
+    "urn:li:geo:106231118": "Coimbra, Coimbra, Portugal",
+    "urn:li:geo:90009659": "Greater Paris Metropolitan Region",
+    "urn:li:geo:101282030": "Alcobaça, Leiria, Portugal",
+    "urn:li:geo:90009884": "Linz-Wels-Steyr Area",
+    "urn:li:geo:90009813": "Greater Terrassa Area",
+    "urn:li:geo:90009925": "Greater Foggia Metropolitan Area",
+    "urn:li:geo:90009886": "Geneva Metropolitan Area",
+    "urn:li:geo:90009563": "Hangzhou-Shaoxing Metropolitan Area",
+    "urn:li:geo:90009817": "Greater Valladolid Metropolitan Area",
+    "urn:li:geo:90009673": "Greater Grenoble Metropolitan Area",
+    "urn:li:geo:101784658": "Rangpur, Rajshahi, Bangladesh",
+    "urn:li:geo:113018621": "Bertamirans, Galicia, Spain",
+    "urn:li:geo:106750182": "Shenzhen, Guangdong, China",
+    "urn:li:geo:101321504": "Mar del Plata, Buenos Aires Province, Argentina",
+    "urn:li:geo:90010275": "Novi Sad Metropolitan Area",
+    "urn:li:geo:105224633": "Canet de Mar, Catalonia, Spain",
+    "urn:li:geo:106635744": "Aguaí, São Paulo, Brazil",
+    "urn:li:geo:90010347": "Greater Braga Area",
+    "urn:li:geo:90009652": "Greater Allahabad Area",
+    "urn:li:geo:105436342": "Los Llanos de Aridane, Canary Islands, Spain",
+    "urn:li:geo:106702806": "Marau, Rio Grande do Sul, Brazil",
+    "urn:li:geo:90009579": "Greater Curitiba",
+    "urn:li:geo:102779754": "Jamshedpur, Jharkhand, India",
+    "urn:li:geo:101942640": "Noia, Galicia, Spain",
+    "urn:li:geo:90009768": "Greater Castellón de la Plana Area",
+    "urn:li:geo:90009580": "Greater Campinas",
+    "urn:li:geo:90009937": "Greater Modena Metropolitan Area",
+    "urn:li:geo:90009766": "Greater Cádiz Metropolitan Area",
+    "urn:li:geo:102628138": "Sabiote, Andalusia, Spain",
+    "urn:li:geo:106683083": "Cardedeu, Catalonia, Spain",
+    "urn:li:geo:90009801": "Greater Ponferrada Metropolitan Area",
+    "urn:li:geo:90009834": "Wroclaw Metropolitan Area",
+    # --- Sectores (Industries) ---
+    "urn:li:industry:11": "Management Consulting",
+    "urn:li:industry:135": "Mechanical Or Industrial Engineering",
+    "urn:li:industry:64": "Ranching",
+    "urn:li:industry:96": "Information Technology & Services",
+    "urn:li:industry:4": "Computer Software",
+    "urn:li:industry:63": "Farming",
+    "urn:li:industry:48": "Construction",
+    "urn:li:industry:133": "Wholesale",
+    "urn:li:industry:99": "Design",
+    "urn:li:industry:25": "Consumer Goods",
+    "urn:li:industry:23": "Food Production",
+    "urn:li:industry:6": "Internet",
+    "urn:li:industry:55": "Machinery",
+    "urn:li:industry:117": "Plastics",
+    "urn:li:industry:68": "Higher Education",
+    "urn:li:industry:53": "Automotive",
+    "urn:li:industry:41": "Banking",
+    "urn:li:industry:134": "Import & Export",
+    "urn:li:industry:84": "Information Services",
+    "urn:li:industry:108": "Translation & Localization",
+    "urn:li:industry:19": "Apparel & Fashion",
+    "urn:li:industry:116": "Logistics & Supply Chain",
+    "urn:li:industry:75": "Government Administration",
+    "urn:li:industry:70": "Research",
+    "urn:li:industry:112": "Electrical & Electronic Manufacturing",
+    "urn:li:industry:3241": "Sector 3241",
+    "urn:li:industry:56": "Mining & Metals",
+    "urn:li:industry:124": "Health, Wellness & Fitness",
+    "urn:li:industry:51": "Civil Engineering",
+    "urn:li:industry:141": "International Trade & Development",
+    "urn:li:industry:383": "Sector 383",
+    "urn:li:industry:1042": "Sector 1042",
+    "urn:li:industry:42": "Insurance",
+    "urn:li:industry:57": "Oil & Energy",
+    "urn:li:industry:481": "Sector 481",
+    "urn:li:industry:1862": "Sector 1862",
+    "urn:li:industry:34": "Food & Beverages",
+    "urn:li:industry:80": "Marketing & Advertising",
+    "urn:li:industry:840": "Sector 840",
+    "urn:li:industry:69": "Education Management",
+    "urn:li:industry:59": "Utilities",
+    "urn:li:industry:143": "Luxury Goods & Jewelry",
+    "urn:li:industry:9": "Law Practice",
+    "urn:li:industry:8": "Telecommunications",
+    "urn:li:industry:100": "Non-profit Organization Management",
+    "urn:li:industry:147": "Industrial Automation",
+    "urn:li:industry:709": "Sector 709",
+    "urn:li:industry:3242": "Sector 3242",
+    "urn:li:industry:86": "Environmental Services",
+    "urn:li:industry:15": "Pharmaceuticals",
+    "urn:li:industry:30": "Leisure, Travel & Tourism",
+    "urn:li:industry:67": "Primary/Secondary Education",
+    "urn:li:industry:12": "Biotechnology",
+    "urn:li:industry:3099": "Sector 3099",
+    "urn:li:industry:27": "Retail",
+    "urn:li:industry:150": "Horticulture",
+    "urn:li:industry:24": "Consumer Electronics",
+    "urn:li:industry:118": "Computer & Network Security",
+    "urn:li:industry:52": "Aviation & Aerospace",
+    "urn:li:industry:49": "Building Materials",
+    "urn:li:industry:2458": "Sector 2458",
+    "urn:li:industry:102": "Program Development",
+    "urn:li:industry:7": "Semiconductors",
+    "urn:li:industry:94": "Airlines/Aviation",
+    "urn:li:industry:1999": "Sector 1999",
+    "urn:li:industry:87": "Package/Freight Delivery",
+    "urn:li:industry:3106": "Sector 3106",
+    "urn:li:industry:82": "Publishing",
+    "urn:li:industry:79": "Public Policy",
+    "urn:li:industry:33": "Sports",
+    "urn:li:industry:32": "Restaurants",
+    "urn:li:industry:31": "Hospitality",
+    "urn:li:industry:14": "Hospital & Health Care",
+    "urn:li:industry:5": "Computer Networking",
+    "urn:li:industry:66": "Fishery",
+    "urn:li:industry:29": "Gambling & Casinos",
+    "urn:li:industry:65": "Dairy",
+    "urn:li:industry:1445": "Sector 1445",
+    "urn:li:industry:928": "Sector 928",
+    "urn:li:industry:408": "Sector 408",
+    "urn:li:industry:148": "Government Relations",
+    "urn:li:industry:3128": "Sector 3128",
+    "urn:li:industry:2029": "Sector 2029",
+    "urn:li:industry:2360": "Sector 2360",
+    "urn:li:industry:126": "Media Production",
+    "urn:li:industry:1916": "Sector 1916",
+    "urn:li:industry:1905": "Sector 1905",
+    "urn:li:industry:22": "Supermarkets",
+    "urn:li:industry:111": "Arts & Crafts",
+    "urn:li:industry:110": "Events Services",
+    "urn:li:industry:20": "Sporting Goods",
+    "urn:li:industry:256": "Sector 256",
+    "urn:li:industry:105": "Professional Training & Coaching",
+    "urn:li:industry:104": "Staffing & Recruiting",
+    "urn:li:industry:47": "Accounting",
+    "urn:li:industry:44": "Real Estate",
+    "urn:li:industry:43": "Financial Services",
+    "urn:li:industry:93": "Warehousing",
+    "urn:li:industry:92": "Transportation/Trucking/Railroad",
+    "urn:li:industry:90": "Civic & Social Organization",
+}
+
+# Mapeo del parámetro solicitado a la clave del JSON de respuesta y la clave interna del ítem
+_FIELD_MAPPING = {
+    "SENIORITY": ("followerCountsBySeniority", "seniority"),
+    "INDUSTRY": ("followerCountsByIndustry", "industry"),
+    "FUNCTION": ("followerCountsByFunction", "function"),
+    "COMPANY_SIZE": ("followerCountsByStaffCountRange", "staffCountRange"),
+    "GEOGRAPHIC_AREA": ("followerCountsByGeo", "geo")
+}
+
+# Caché del URN personal por hash del token: en memoria y persistida en disco
+# para no repetir la llamada a /v2/userinfo en cada LinkedInClient()
+_URN_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "publicador_urn.json")
+_URN_CACHE_LOCK = threading.Lock()
+_URN_CACHE = None
+
+
+def _token_key(access_token):
+    return hashlib.blake2b(access_token.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _load_urn_cache():
+    global _URN_CACHE
+    if _URN_CACHE is None:
+        try:
+            with open(_URN_CACHE_PATH, encoding="utf-8") as f:
+                _URN_CACHE = json.load(f)
+        except (OSError, ValueError):
+            _URN_CACHE = {}
+    return _URN_CACHE
+
+
+def _get_cached_urn(access_token):
+    with _URN_CACHE_LOCK:
+        return _load_urn_cache().get(_token_key(access_token))
+
+
+def _store_cached_urn(access_token, urn):
+    with _URN_CACHE_LOCK:
+        cache = _load_urn_cache()
+        cache[_token_key(access_token)] = urn
+        try:
+            os.makedirs(os.path.dirname(_URN_CACHE_PATH), exist_ok=True)
+            with open(_URN_CACHE_PATH, "w", encoding="utf-8") as f:
+                json.dump(cache, f)
+        except OSError as e:
+            logger.warning(f"⚠️ No se pudo guardar la caché de URN: {e}")
+
+
+def _dumps(payload) -> bytes:
+    """Serializa a JSON (bytes) con orjson si está disponible; si no, con json."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(response):
+    """Decodifica el cuerpo JSON de una respuesta con orjson si está disponible."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _iter_segment_items(response, target_field):
+    """
+    Recorre solo las entradas de `target_field` de la respuesta de seguidores.
+    Con ijson el cuerpo se parsea en streaming y se saltan el resto de segmentaciones.
+    """
+    if ijson is not None:
+        response.raw.decode_content = True
+        return ijson.items(response.raw, f"elements.item.{target_field}.item", use_float=True)
+    return (item for el in _loads(response).get('elements', []) for item in el.get(target_field, []))
+
+
+@dataclass(frozen=True, slots=True)
+class LinkedInConfig:
+    """Configuración del cliente de LinkedIn leída del entorno."""
+    access_token: str | None
+    organization_id: str | None
+    post_visibility: str = "PUBLIC"
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            access_token=os.getenv("ACCESS_TOKEN_LINKEDIN"),
+            organization_id=os.getenv("LINKEDIN_ORGANIZATION_ID"),
+            post_visibility=os.getenv("POST_VISIBILITY", "PUBLIC"),
+        )
+
+
+# El .env se lee una sola vez al importar el módulo
+load_dotenv()
+CONFIG = LinkedInConfig.from_env()
+
 
 class LinkedInClient:
     """
@@ -17,9 +355,8 @@ class LinkedInClient:
     Soporta publicaciones en perfiles personales y páginas de empresa.
     """
 
-    def __init__(self):
-        load_dotenv()
-        self.access_token = os.getenv("ACCESS_TOKEN_LINKEDIN")
+    def __init__(self, config: LinkedInConfig = CONFIG):
+        self.access_token = config.access_token
         if not self.access_token:
             logger.critical("❌ ERROR CRÍTICO: No se pudo cargar ACCESS_TOKEN_LINKEDIN desde el archivo .env.")
             raise ValueError("El token de acceso de LinkedIn no está configurado.")
@@ -31,8 +368,15 @@ class LinkedInClient:
             "LinkedIn-Version": "202601"
         }
 
+        # Sesión compartida: keep-alive y pool de conexiones hacia api.linkedin.com.
+        # Solo se reintentan métodos idempotentes (no los POST de publicación).
+        self.session = requests.Session()
+        self.session.headers.update(self.api_headers)
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        self.session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry))
+
         # Verificar si se debe publicar en una página de empresa u organización
-        self.organization_id = os.getenv("LINKEDIN_ORGANIZATION_ID")
+        self.organization_id = config.organization_id
         self.base_url = "https://api.linkedin.com/rest"
         if self.organization_id:
             # Publicar en página de empresa
@@ -44,17 +388,42 @@ class LinkedInClient:
             self.author_urn = self._get_user_urn()
             self.is_organization = False
 
-        self.post_visibility = os.getenv("POST_VISIBILITY", "PUBLIC")
+        # El autor no cambia durante la vida del cliente: se codifica una sola vez
+        self._quoted_author_urn = urllib.parse.quote(self.author_urn)
+        self.post_visibility = config.post_visibility
+
+        # Parte fija del payload de publicación (autor, estado y visibilidad)
+        self._base_payload = {
+            "author": self.author_urn,
+            "lifecycleState": "PUBLISHED",
+            "visibility": {"com.linkedin.ugc.MemberNetworkVisibility": self.post_visibility}
+        }
+
+    def close(self):
+        """Cierra la sesión HTTP y libera sus conexiones."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
     def _get_user_urn(self):
-        """Obtiene el URN del usuario autenticado (perfil personal)."""
+        """Obtiene el URN del usuario autenticado (perfil personal), usando la caché si existe."""
+        cached_urn = _get_cached_urn(self.access_token)
+        if cached_urn:
+            logger.info(f"✅ URN de usuario en caché: {cached_urn}")
+            return cached_urn
+
         logger.info("Obteniendo URN de usuario de LinkedIn...")
         try:
-            response = requests.get("https://api.linkedin.com/v2/userinfo", headers={"Authorization": f"Bearer {self.access_token}"})
+            response = self.session.get("https://api.linkedin.com/v2/userinfo", timeout=LINKEDIN_TIMEOUT)
             response.raise_for_status()
-            user_info = response.json()
+            user_info = _loads(response)
             user_urn = f"urn:li:person:{user_info['sub']}"
             logger.info(f"✅ URN de usuario obtenido: {user_urn}")
+            _store_cached_urn(self.access_token, user_urn)
             return user_urn
         except requests.exceptions.HTTPError as e:
             logger.error(f"❌ ERROR al obtener el URN de LinkedIn: {e.response.status_code} - {e.response.text}")
@@ -72,9 +441,9 @@ class LinkedInClient:
             }
         }
         try:
-            response = requests.post("https://api.linkedin.com/v2/assets?action=registerUpload", headers=self.api_headers, json=payload)
+            response = self.session.post("https://api.linkedin.com/v2/assets?action=registerUpload", json=payload, timeout=LINKEDIN_TIMEOUT)
             response.raise_for_status()
-            data = response.json()
+            data = _loads(response)
             upload_url = data['value']['uploadMechanism']['com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest']['uploadUrl']
             asset_urn = data['value']['asset']
             logger.info(f"✅ Asset registrado con éxito. URN: {asset_urn}")
@@ -88,8 +457,14 @@ class LinkedInClient:
         logger.info(f"Subiendo fichero: {file_path}...")
         try:
             with open(file_path, 'rb') as f:
-                headers = {'Content-Type': 'application/octet-stream'}
-                response = requests.put(upload_url, headers=headers, data=f)
+                # Tamaño explícito: el cuerpo se envía en streaming desde el fichero
+                # con Content-Length, nunca con Transfer-Encoding: chunked
+                size = os.fstat(f.fileno()).st_size
+                headers = {'Content-Type': 'application/octet-stream', 'Content-Length': str(size)}
+                logger.info(f"Tamaño del fichero: {size} bytes")
+                # Los ficheros pequeños se leen de una vez y salen en un solo envío
+                body = f.read() if size < SMALL_UPLOAD_BYTES else f
+                response = self.session.put(upload_url, headers=headers, data=body, timeout=LINKEDIN_TIMEOUT)
                 response.raise_for_status()
                 logger.info(f"✅ Fichero subido correctamente (Status: {response.status_code}).")
         except FileNotFoundError:
@@ -99,6 +474,12 @@ class LinkedInClient:
             logger.error(f"❌ ERROR al subir el fichero a LinkedIn: {e.response.status_code} - {e.response.text}")
             raise
 
+    def _register_and_upload_image(self, path):
+        """Registra un asset de imagen y sube el fichero; devuelve el URN del asset."""
+        asset_urn, upload_url = self._register_asset(is_video=False)
+        self._upload_file(upload_url, path)
+        return asset_urn
+
     def post(self, text: str, image_paths: list = None, video_path: str = None):
         """Crea una nueva publicación en LinkedIn.
         - Si no se proporcionan medios, publica solo texto.
@@ -118,11 +499,9 @@ class LinkedInClient:
         # Publicación con imágenes
         elif image_paths:
             logger.info(f"Tipo de publicación: IMAGEN ({len(image_paths)} ficheros)")
-            asset_urns = []
-            for path in image_paths:
-                asset_urn, upload_url = self._register_asset(is_video=False)
-                self._upload_file(upload_url, path)
-                asset_urns.append(asset_urn)
+            # Registro + subida de cada imagen en paralelo; map conserva el orden del carrusel
+            with ThreadPoolExecutor(max_workers=min(len(image_paths), IMAGE_UPLOAD_WORKERS)) as executor:
+                asset_urns = list(executor.map(self._register_and_upload_image, image_paths))
             media_category = "IMAGE"
             media_list = [{"status": "READY", "media": urn} for urn in asset_urns]
 
@@ -132,33 +511,22 @@ class LinkedInClient:
             media_category = "NONE"
             media_list = []
 
-        # Payload de la publicación
-        payload = {
-            "author": self.author_urn,
-            "lifecycleState": "PUBLISHED",
-            "specificContent": {
-                "com.linkedin.ugc.ShareContent": {
-                    "shareCommentary": {"text": text},
-                    "shareMediaCategory": media_category
-                }
-            },
-            "visibility": {"com.linkedin.ugc.MemberNetworkVisibility": self.post_visibility}
+        # Contenido de la publicación; la clave "media" solo si hay medios
+        share_content = {
+            "shareCommentary": {"text": text},
+            "shareMediaCategory": media_category
         }
-
-        # Para organizaciones, usar PUBLIC en lugar de MemberNetworkVisibility si es necesario
-        if self.is_organization and self.post_visibility == "PUBLIC":
-            payload["visibility"] = {"com.linkedin.ugc.MemberNetworkVisibility": "PUBLIC"}
-
-        # Añadir la clave "media" solo si hay medios
         if media_list:
-            payload["specificContent"]["com.linkedin.ugc.ShareContent"]["media"] = media_list
+            share_content["media"] = media_list
+
+        payload = self._base_payload | {"specificContent": {"com.linkedin.ugc.ShareContent": share_content}}
 
         logger.info("Enviando payload final a LinkedIn...")
         try:
-            response = requests.post("https://api.linkedin.com/v2/ugcPosts", headers=self.api_headers, data=json.dumps(payload))
+            response = self.session.post("https://api.linkedin.com/v2/ugcPosts", data=_dumps(payload), timeout=LINKEDIN_TIMEOUT)
             response.raise_for_status()
             logger.info("🎉 ¡Publicación en LinkedIn realizada con éxito!")
-            return response.json()
+            return _loads(response)
         except requests.exceptions.HTTPError as e:
             logger.error(f"❌ ERROR al crear la publicación final en LinkedIn: {e.response.status_code} - {e.response.text}")
             raise
@@ -172,26 +540,23 @@ class LinkedInClient:
                 "organizationalEntity": self.author_urn
             }
 
-            response = requests.get(url, headers=self.api_headers, params=query_params)
+            response = self.session.get(url, params=query_params, timeout=LINKEDIN_TIMEOUT)
 
             if response.status_code == 200:
                 logger.info("✅ Petición exitosa a LinkedIn")
-                elements = response.json().get('elements', [])
-                data = []
-                for item in elements:
-
-                    stats = item.get('totalShareStatistics', {})
-                    
-                    data.append({
-                        'fecha': pd.to_datetime(item['timeRange']['start'], unit='ms').date(),
-                        'impresiones': stats.get('impressionCount', 0),
-                        'clics': stats.get('clickCount', 0),
-                        'likes': stats.get("likeCount", 0),
-                        'comentarios': stats.get("commentCount", 0),
-                        'compartidos': stats.get("shareCount", 0),
-                        'engagement': stats.get("engagement", 0) 
-                    })
-                return pd.DataFrame(data)
+                elements = _loads(response).get('elements', [])
+                # Construcción por columnas y conversión de fechas en una sola llamada
+                starts = [item['timeRange']['start'] for item in elements]
+                stats = [item.get('totalShareStatistics', {}) for item in elements]
+                return pd.DataFrame({
+                    'fecha': pd.to_datetime(starts, unit='ms').date,
+                    'impresiones': np.asarray([st.get('impressionCount', 0) for st in stats], dtype=np.int32),
+                    'clics': np.asarray([st.get('clickCount', 0) for st in stats], dtype=np.int32),
+                    'likes': np.asarray([st.get("likeCount", 0) for st in stats], dtype=np.int32),
+                    'comentarios': np.asarray([st.get("commentCount", 0) for st in stats], dtype=np.int32),
+                    'compartidos': np.asarray([st.get("shareCount", 0) for st in stats], dtype=np.int32),
+                    'engagement': [st.get("engagement", 0) for st in stats]
+                })
             else:
                 logger.error(f"❌ ERROR: {response.status_code} - {response.text}")
                 return None
@@ -210,9 +575,9 @@ class LinkedInClient:
             "count":count
             }
         try:
-            response = requests.get(url,headers=self.api_headers,params=params)
+            response = self.session.get(url,params=params, timeout=LINKEDIN_TIMEOUT)
             if response.status_code==200:
-                elements=response.json().get('elements',[])
+                elements=_loads(response).get('elements',[])
                 urns = [post['id'] for post in elements]
                 logger.info(f"✅ Se han encontrado {len(urns)} posts recientes.")
                 return urns
@@ -240,8 +605,8 @@ class LinkedInClient:
 
         # FILTRAR: Solo procesar posts de tipo 'share', excluir 'ugcPost'
         # El endpoint organizationalEntityShareStatistics NO acepta ugcPost
-        valid_post_ids = [pid for pid in post_ids if 'urn:li:share:' in pid]
-        ugc_posts = [pid for pid in post_ids if 'urn:li:ugcPost:' in pid]
+        valid_post_ids = [pid for pid in post_ids if pid.startswith('urn:li:share:')]
+        ugc_posts = [pid for pid in post_ids if pid.startswith('urn:li:ugcPost:')]
 
         if ugc_posts:
             logger.warning(f"⚠️ Se encontraron {len(ugc_posts)} posts de tipo ugcPost que NO se pueden procesar con este endpoint")
@@ -251,47 +616,67 @@ class LinkedInClient:
             logger.error("❌ No hay posts de tipo 'share' para procesar. Todos son ugcPost.")
             return None
 
-        valid_post_ids = valid_post_ids[:20]
+        # La API acepta como máximo SHARE_STATS_BATCH_SIZE shares por petición:
+        # se trocea y se lanzan los trozos en paralelo
+        chunks = [
+            valid_post_ids[i:i + SHARE_STATS_BATCH_SIZE]
+            for i in range(0, len(valid_post_ids), SHARE_STATS_BATCH_SIZE)
+        ]
+
+        logger.info(
+            f"📊 Consultando métricas para {len(valid_post_ids)} publicaciones (tipo 'share') "
+            f"en {len(chunks)} peticiones..."
+        )
+
+        if len(chunks) == 1:
+            frames = [self._fetch_post_metrics_chunk(chunks[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(POST_METRICS_WORKERS, len(chunks))) as executor:
+                frames = list(executor.map(self._fetch_post_metrics_chunk, chunks))
 
-        logger.info(f"📊 Consultando métricas para {len(valid_post_ids)} publicaciones (tipo 'share')...")
+        frames = [df for df in frames if df is not None]
+        if not frames:
+            return None
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames, ignore_index=True)
 
+    def _fetch_post_metrics_chunk(self, post_ids):
+        """Consulta las métricas de hasta SHARE_STATS_BATCH_SIZE shares en una sola petición."""
         try:
-            encoded_ids = [urllib.parse.quote(pid) for pid in valid_post_ids]
-            shares_param = f"List({','.join(encoded_ids)})"
+            shares_param = f"List({','.join(map(urllib.parse.quote, post_ids))})"
 
             url = (
                 f"{self.base_url}/organizationalEntityShareStatistics"
                 f"?q=organizationalEntity"
-                f"&organizationalEntity={urllib.parse.quote(self.author_urn)}"
+                f"&organizationalEntity={self._quoted_author_urn}"
                 f"&shares={shares_param}"
             )
 
-            response = requests.get(url, headers=self.api_headers)
+            response = self.session.get(url, timeout=LINKEDIN_TIMEOUT)
 
             if response.status_code == 200:
-                elements = response.json().get('elements', [])
-                data = []
-                for item in elements:
-                    stats = item.get('totalShareStatistics', {})
-                    
-                    imp = stats.get('impressionCount', 0)
-                    cli = stats.get('clickCount', 0)
-                    lik = stats.get('likeCount', 0)
-                    com = stats.get('commentCount', 0)
-                    sha = stats.get('shareCount', 0)
-                    
-                    er = ((lik + com + sha + cli) / imp * 100) if imp > 0 else 0
-
-                    data.append({
-                        'post_id': item.get('share'),
-                        'impresiones': imp,
-                        'clics': cli,
-                        'likes': lik,
-                        'comentarios': com,
-                        'compartidos': sha,
-                        'ER%': round(er, 2)
-                    })
-                return pd.DataFrame(data)
+                elements = _loads(response).get('elements', [])
+                stats = [item.get('totalShareStatistics', {}) for item in elements]
+
+                imp = np.array([st.get('impressionCount', 0) for st in stats], dtype=np.int64)
+                cli = np.array([st.get('clickCount', 0) for st in stats], dtype=np.int64)
+                lik = np.array([st.get('likeCount', 0) for st in stats], dtype=np.int64)
+                com = np.array([st.get('commentCount', 0) for st in stats], dtype=np.int64)
+                sha = np.array([st.get('shareCount', 0) for st in stats], dtype=np.int64)
+
+                # ER% vectorizado; 0 cuando no hay impresiones
+                er = np.divide(lik + com + sha + cli, imp, out=np.zeros(len(imp)), where=imp > 0) * 100
+
+                return pd.DataFrame({
+                    'post_id': [item.get('share') for item in elements],
+                    'impresiones': imp,
+                    'clics': cli,
+                    'likes': lik,
+                    'comentarios': com,
+                    'compartidos': sha,
+                    'ER%': er.round(2)
+                })
             else:
                 logger.error(f"❌ Error {response.status_code}: {response.text}")
                 logger.error(f"URL de fallo: {url}")
@@ -314,272 +699,45 @@ class LinkedInClient:
             "organizationalEntity": self.author_urn
         }
 
-        # Diccionario para traducir los URNs a nombres legibles
-        labels_map = {
-            "urn:li:seniority:1": "Sin experiencia", "urn:li:seniority:2": "En prácticas",
-            "urn:li:seniority:3": "Junior", "urn:li:seniority:4": "Associate",
-            "urn:li:seniority:5": "Senior", "urn:li:seniority:6": "Manager",
-            "urn:li:seniority:7": "Director", "urn:li:seniority:8": "VP",
-            "urn:li:seniority:9": "CXO", "urn:li:seniority:10": "Socio",
-            "urn:li:companySize:B": "1 empleado", "urn:li:companySize:C": "2-10 emp",
-            "urn:li:companySize:D": "11-50 emp", "urn:li:companySize:E": "51-200 emp",
-            "urn:li:companySize:F": "201-500 emp", "urn:li:companySize:G": "501-1000 emp",
-            "urn:li:companySize:H": "1001-5000 emp", "urn:li:companySize:I": "5001-10.000 emp",
-            "urn:li:companySize:J": "10.001+ emp",
-            "urn:li:geo:90009796": "Greater Orense Area",
-            "urn:li:geo:90009818": "Greater Vigo Metropolitan Area",
-            "urn:li:geo:90009790": "Greater Madrid Metropolitan Area",
-            "urn:li:geo:90009773": "Greater Ferrol Metropolitan Area",
-            "urn:li:geo:90009789": "Greater Lugo Metropolitan Area",
-            "urn:li:geo:90009761": "Greater Barcelona Metropolitan Area",
-            "urn:li:geo:90009795": "Greater Murcia Metropolitan Area",
-            "urn:li:geo:90009809": "Greater Santiago de Compostela Metropolitan Area",
-            "urn:li:geo:90009810": "Greater Sevilla Metropolitan Area",
-            "urn:li:geo:90009816": "Greater Valencia Metropolitan Area",
-            "urn:li:geo:90009776": "Greater Gijón Metropolitan Area",
-            "urn:li:geo:90009805": "Greater Salamanca Metropolitan Area",
-            "urn:li:geo:90009791": "Greater Málaga Metropolitan Area",
-            "urn:li:geo:90009787": "Greater Lerida Area",
-            "urn:li:geo:90009756": "Greater Alicante Area",
-            "urn:li:geo:90009830": "Cracow Metropolitan Area",
-            "urn:li:geo:90010133": "Bogotá D.C. Metropolitan Area",
-            "urn:li:geo:90009763": "Greater Bilbao Metropolitan Area",
-            "urn:li:geo:90009786": "Greater León, Spain Area",
-            "urn:li:geo:90009757": "Greater Almería Metropolitan Area",
-            "urn:li:geo:90009899": "Santiago Metropolitan Area",
-            "urn:li:geo:90010274": "Belgrade Metropolitan Area",
-            "urn:li:geo:90009770": "Greater Córdoba, Spain Area",
-            "urn:li:geo:90010142": "Medellín Metropolitan Area",
-            "urn:li:geo:90010352": "Lisbon Metropolitan Area",
-            "urn:li:geo:104332104": "Qingdao, Shandong, China",
-            "urn:li:geo:106486848": "Águilas, Región de Murcia, Spain",
-            "urn:li:geo:90010045": "Mexico City Metropolitan Area",
-            "urn:li:geo:90010354": "Porto Metropolitan Area",
-            "urn:li:geo:90009784": "Greater Jerez de la Frontera Metropolitan Area",
-            "urn:li:geo:90009792": "Greater Manresa Metropolitan Area",
-            "urn:li:geo:90009812": "Greater Tarragona Area",
-            "urn:li:geo:90009822": "Greater Zaragoza Metropolitan Area",
-            "urn:li:geo:90009936": "Greater Milan Metropolitan Area",
-            "urn:li:geo:90010414": "Grand Tunis Metropolitan Area",
-            "urn:li:geo:90009765": "Greater Cáceres Metropolitan Area",
-            "urn:li:geo:90009804": "Greater Sabadell Metropolitan Area",
-            "urn:li:geo:90009870": "Greater Buenos Aires",
-            "urn:li:geo:90009814": "Toledo, Spain Metropolitan Area",
-            "urn:li:geo:90009946": "Greater Pescara Metropolitan Area",
-            "urn:li:geo:90009797": "Greater Oviedo Metropolitan Area",
-            "urn:li:geo:90009753": "Greater La Coruña Area",
-            "urn:li:geo:90009778": "Greater Granada Metropolitan Area",
-            "urn:li:geo:90010421": "Greater Ankara",
-            "urn:li:geo:100238888": "Boiro, Galicia, Spain",
-            "urn:li:geo:90010261": "Doha Metropolitan Area",
-            "urn:li:geo:102007122": "Cairo, Egypt",
-            "urn:li:geo:90009735": "Greater Munich Metropolitan Area",
-            "urn:li:geo:104279445": "Miño, Galicia, Spain",
-            "urn:li:geo:101623594": "Popayán, Cauca, Colombia",
-            "urn:li:geo:90009949": "Greater Pordenone Metropolitan Area",
-            "urn:li:geo:107845132": "Požarevac, Centralna Srbija, Serbia",
-            "urn:li:geo:90010046": "Monterrey Metropolitan Area",
-            "urn:li:geo:101614633": "Soria, Castilla and Leon, Spain",
-            "urn:li:geo:101181680": "León, Castilla and Leon, Spain",
-            "urn:li:geo:102304121": "Negreira, Galicia, Spain",
-            "urn:li:geo:90009603": "Antwerp Metropolitan Area",
-            "urn:li:geo:105303313": "Órdenes, Galicia, Spain",
-            "urn:li:geo:103061829": "Santa Uxía, Galicia, Spain",
-            "urn:li:geo:90009871": "Cordoba, Argentina Metropolitan Area",
-            "urn:li:geo:90009794": "Greater Mataró Metropolitan Area",
-            "urn:li:geo:102344967": "Fuzhou, Fujian, China",
-            "urn:li:geo:90009894": "Greater Chillan Area",
-            "urn:li:geo:90009874": "Greater Rosario",
-            "urn:li:geo:101887839": "Geilenkirchen, North Rhine-Westphalia, Germany",
-            "urn:li:geo:102763519": "Outes, Galicia, Spain",
-            "urn:li:geo:104424298": "Athens, Georgia, United States",
-            "urn:li:geo:106181918": "Montalbán de Córdoba, Andalusia, Spain",
-            "urn:li:geo:106231118": "Coimbra, Coimbra, Portugal",
-            "urn:li:geo:90009659": "Greater Paris Metropolitan Region",
-            "urn:li:geo:101282030": "Alcobaça, Leiria, Portugal",
-            "urn:li:geo:90009884": "Linz-Wels-Steyr Area",
-            "urn:li:geo:90009813": "Greater Terrassa Area",
-            "urn:li:geo:90009925": "Greater Foggia Metropolitan Area",
-            "urn:li:geo:90009886": "Geneva Metropolitan Area",
-            "urn:li:geo:90009563": "Hangzhou-Shaoxing Metropolitan Area",
-            "urn:li:geo:90009817": "Greater Valladolid Metropolitan Area",
-            "urn:li:geo:90009673": "Greater Grenoble Metropolitan Area",
-            "urn:li:geo:101784658": "Rangpur, Rajshahi, Bangladesh",
-            "urn:li:geo:113018621": "Bertamirans, Galicia, Spain",
-            "urn:li:geo:106750182": "Shenzhen, Guangdong, China",
-            "urn:li:geo:101321504": "Mar del Plata, Buenos Aires Province, Argentina",
-            "urn:li:geo:90010275": "Novi Sad Metropolitan Area",
-            "urn:li:geo:105224633": "Canet de Mar, Catalonia, Spain",
-            "urn:li:geo:106635744": "Aguaí, São Paulo, Brazil",
-            "urn:li:geo:90010347": "Greater Braga Area",
-            "urn:li:geo:90009652": "Greater Allahabad Area",
-            "urn:li:geo:105436342": "Los Llanos de Aridane, Canary Islands, Spain",
-            "urn:li:geo:106702806": "Marau, Rio Grande do Sul, Brazil",
-            "urn:li:geo:90009579": "Greater Curitiba",
-            "urn:li:geo:102779754": "Jamshedpur, Jharkhand, India",
-            "urn:li:geo:101942640": "Noia, Galicia, Spain",
-            "urn:li:geo:90009768": "Greater Castellón de la Plana Area",
-            "urn:li:geo:90009580": "Greater Campinas",
-            "urn:li:geo:90009937": "Greater Modena Metropolitan Area",
-            "urn:li:geo:90009766": "Greater Cádiz Metropolitan Area",
-            "urn:li:geo:102628138": "Sabiote, Andalusia, Spain",
-            "urn:li:geo:106683083": "Cardedeu, Catalonia, Spain",
-            "urn:li:geo:90009801": "Greater Ponferrada Metropolitan Area",
-            "urn:li:geo:90009834": "Wroclaw Metropolitan Area",
-            # --- Sectores (Industries) ---
-            "urn:li:industry:11": "Management Consulting",
-            "urn:li:industry:135": "Mechanical Or Industrial Engineering",
-            "urn:li:industry:64": "Ranching",
-            "urn:li:industry:96": "Information Technology & Services",
-            "urn:li:industry:4": "Computer Software",
-            "urn:li:industry:63": "Farming",
-            "urn:li:industry:48": "Construction",
-            "urn:li:industry:133": "Wholesale",
-            "urn:li:industry:99": "Design",
-            "urn:li:industry:25": "Consumer Goods",
-            "urn:li:industry:23": "Food Production",
-            "urn:li:industry:6": "Internet",
-            "urn:li:industry:55": "Machinery",
-            "urn:li:industry:117": "Plastics",
-            "urn:li:industry:68": "Higher Education",
-            "urn:li:industry:53": "Automotive",
-            "urn:li:industry:41": "Banking",
-            "urn:li:industry:134": "Import & Export",
-            "urn:li:industry:84": "Information Services",
-            "urn:li:industry:108": "Translation & Localization",
-            "urn:li:industry:19": "Apparel & Fashion",
-            "urn:li:industry:116": "Logistics & Supply Chain",
-            "urn:li:industry:75": "Government Administration",
-            "urn:li:industry:70": "Research",
-            "urn:li:industry:112": "Electrical & Electronic Manufacturing",
-            "urn:li:industry:3241": "Sector 3241",
-            "urn:li:industry:56": "Mining & Metals",
-            "urn:li:industry:124": "Health, Wellness & Fitness",
-            "urn:li:industry:51": "Civil Engineering",
-            "urn:li:industry:141": "International Trade & Development",
-            "urn:li:industry:383": "Sector 383",
-            "urn:li:industry:1042": "Sector 1042",
-            "urn:li:industry:42": "Insurance",
-            "urn:li:industry:57": "Oil & Energy",
-            "urn:li:industry:481": "Sector 481",
-            "urn:li:industry:1862": "Sector 1862",
-            "urn:li:industry:34": "Food & Beverages",
-            "urn:li:industry:80": "Marketing & Advertising",
-            "urn:li:industry:840": "Sector 840",
-            "urn:li:industry:69": "Education Management",
-            "urn:li:industry:59": "Utilities",
-            "urn:li:industry:143": "Luxury Goods & Jewelry",
-            "urn:li:industry:9": "Law Practice",
-            "urn:li:industry:8": "Telecommunications",
-            "urn:li:industry:100": "Non-profit Organization Management",
-            "urn:li:industry:147": "Industrial Automation",
-            "urn:li:industry:709": "Sector 709",
-            "urn:li:industry:3242": "Sector 3242",
-            "urn:li:industry:86": "Environmental Services",
-            "urn:li:industry:15": "Pharmaceuticals",
-            "urn:li:industry:30": "Leisure, Travel & Tourism",
-            "urn:li:industry:67": "Primary/Secondary Education",
-            "urn:li:industry:12": "Biotechnology",
-            "urn:li:industry:3099": "Sector 3099",
-            "urn:li:industry:27": "Retail",
-            "urn:li:industry:150": "Horticulture",
-            "urn:li:industry:24": "Consumer Electronics",
-            "urn:li:industry:118": "Computer & Network Security",
-            "urn:li:industry:52": "Aviation & Aerospace",
-            "urn:li:industry:49": "Building Materials",
-            "urn:li:industry:2458": "Sector 2458",
-            "urn:li:industry:102": "Program Development",
-            "urn:li:industry:7": "Semiconductors",
-            "urn:li:industry:94": "Airlines/Aviation",
-            "urn:li:industry:1999": "Sector 1999",
-            "urn:li:industry:87": "Package/Freight Delivery",
-            "urn:li:industry:3106": "Sector 3106",
-            "urn:li:industry:82": "Publishing",
-            "urn:li:industry:79": "Public Policy",
-            "urn:li:industry:33": "Sports",
-            "urn:li:industry:32": "Restaurants",
-            "urn:li:industry:31": "Hospitality",
-            "urn:li:industry:14": "Hospital & Health Care",
-            "urn:li:industry:5": "Computer Networking",
-            "urn:li:industry:66": "Fishery",
-            "urn:li:industry:29": "Gambling & Casinos",
-            "urn:li:industry:65": "Dairy",
-            "urn:li:industry:1445": "Sector 1445",
-            "urn:li:industry:928": "Sector 928",
-            "urn:li:industry:408": "Sector 408",
-            "urn:li:industry:148": "Government Relations",
-            "urn:li:industry:3128": "Sector 3128",
-            "urn:li:industry:2029": "Sector 2029",
-            "urn:li:industry:2360": "Sector 2360",
-            "urn:li:industry:126": "Media Production",
-            "urn:li:industry:1916": "Sector 1916",
-            "urn:li:industry:1905": "Sector 1905",
-            "urn:li:industry:22": "Supermarkets",
-            "urn:li:industry:111": "Arts & Crafts",
-            "urn:li:industry:110": "Events Services",
-            "urn:li:industry:20": "Sporting Goods",
-            "urn:li:industry:256": "Sector 256",
-            "urn:li:industry:105": "Professional Training & Coaching",
-            "urn:li:industry:104": "Staffing & Recruiting",
-            "urn:li:industry:47": "Accounting",
-            "urn:li:industry:44": "Real Estate",
-            "urn:li:industry:43": "Financial Services",
-            "urn:li:industry:93": "Warehousing",
-            "urn:li:industry:92": "Transportation/Trucking/Railroad",
-            "urn:li:industry:90": "Civic & Social Organization",
-        }
-
-        # Mapeo del parámetro solicitado a la clave del JSON de respuesta y la clave interna del ítem
-        field_mapping = {
-            "SENIORITY": ("followerCountsBySeniority", "seniority"),
-            "INDUSTRY": ("followerCountsByIndustry", "industry"),
-            "FUNCTION": ("followerCountsByFunction", "function"),
-            "COMPANY_SIZE": ("followerCountsByStaffCountRange", "staffCountRange"),
-            "GEOGRAPHIC_AREA": ("followerCountsByGeo", "geo")
-        }
-
-        target_field, inner_key = field_mapping.get(pivot_type, (None, None))
+        target_field, inner_key = _FIELD_MAPPING.get(pivot_type, (None, None))
 
         if not target_field:
             logger.error(f"❌ Tipo de segmentación no soportado: {pivot_type}")
             return None
 
         try:
-            response = requests.get(url, headers=self.api_headers, params=params)
-            if response.status_code == 200:
-                elements = response.json().get('elements', [])
-                data = []
-                for el in elements:
-                    # Obtenemos la lista específica para el pivot solicitado
-                    counts_list = el.get(target_field, [])
-                    
-                    for item in counts_list:
-                        # 1. Obtener la etiqueta (URN) usando la clave correcta
-                        urn = item.get(inner_key)
-                        
-                        # 2. CORRECCIÓN CRÍTICA: Los seguidores están dentro de un objeto 'followerCounts'
-                        # que separa 'organicFollowerCount' y 'paidFollowerCount'.
-                        follower_counts = item.get('followerCounts', {})
-                        organic = follower_counts.get('organicFollowerCount', 0)
-                        paid = follower_counts.get('paidFollowerCount', 0)
-                        total_count = organic + paid
-                        
-                        # Traducimos el URN si está en nuestro mapa
-                        label = labels_map.get(urn, urn)
-                        
-                        data.append({
-                            'segmento': label,
-                            'seguidores': total_count
-                        })
-                
-                if not data:
-                    logger.warning(f"⚠️ No se encontraron datos para la segmentación {pivot_type}.")
+            with self.session.get(url, params=params, timeout=LINKEDIN_TIMEOUT, stream=True) as response:
+                if response.status_code != 200:
+                    logger.error(f"❌ Error en segmentación {response.status_code}: {response.text}")
                     return None
 
-                return pd.DataFrame(data).sort_values(by='seguidores', ascending=False)
-            else:
-                logger.error(f"❌ Error en segmentación {response.status_code}: {response.text}")
+                labels = []
+                counts = []
+                # Solo se recorre la lista específica para el pivot solicitado
+                for item in _iter_segment_items(response, target_field):
+                    # 1. Obtener la etiqueta (URN) usando la clave correcta
+                    urn = item.get(inner_key)
+
+                    # 2. CORRECCIÓN CRÍTICA: Los seguidores están dentro de un objeto 'followerCounts'
+                    # que separa 'organicFollowerCount' y 'paidFollowerCount'.
+                    follower_counts = item.get('followerCounts', {})
+                    organic = follower_counts.get('organicFollowerCount', 0)
+                    paid = follower_counts.get('paidFollowerCount', 0)
+
+                    # Traducimos el URN si está en nuestro mapa
+                    labels.append(_LABELS_MAP.get(urn, urn))
+                    counts.append(organic + paid)
+
+            if not labels:
+                logger.warning(f"⚠️ No se encontraron datos para la segmentación {pivot_type}.")
                 return None
+
+            # Etiquetas como categoría y recuentos int32: se ordena sobre enteros
+            df = pd.DataFrame({
+                'segmento': pd.Categorical(labels),
+                'seguidores': np.asarray(counts, dtype=np.int32)
+            })
+            return df.sort_values(by='seguidores', ascending=False, kind='stable')
         except Exception as e:
             logger.error(f"🔥 Error inesperado: {e}")
             return None
@@ -600,10 +758,10 @@ class LinkedInClient:
         }
         
         try:
-            response = requests.get(url, headers=self.api_headers, params=params)
+            response = self.session.get(url, params=params, timeout=LINKEDIN_TIMEOUT)
             
             if response.status_code == 200:
-                elements = response.json().get('elements', [])
+                elements = _loads(response).get('elements', [])
                 posts_data = []
                 
                 for post in elements:
@@ -705,10 +863,10 @@ class LinkedInClient:
                     if aggregation and metric_type != "MEMBERS_REACHED":
                         params["aggregation"] = aggregation
 
-                    response = requests.get(url, headers=self.api_headers, params=params)
+                    response = self.session.get(url, params=params, timeout=LINKEDIN_TIMEOUT)
 
                     if response.status_code == 200:
-                        data = response.json()
+                        data = _loads(response)
                         elements = data.get('elements', [])
 
                         if elements:
@@ -803,10 +961,10 @@ class LinkedInClient:
                 if time_range:
                     params["timeRange"] = f"(start:{time_range['start']},end:{time_range['end']})"
 
-                response = requests.get(url, headers=self.api_headers, params=params)
+                response = self.session.get(url, params=params, timeout=LINKEDIN_TIMEOUT)
 
                 if response.status_code == 200:
-                    data = response.json()
+                    data = _loads(response)
                     elements = data.get('elements', [])
 
                     if elements:
@@ -868,10 +1026,10 @@ class LinkedInClient:
                 "timeIntervals.timeRange.start": int((pd.Timestamp.now() - pd.Timedelta(days=days)).timestamp() * 1000)
             }
 
-            response = requests.get(url, headers=self.api_headers, params=params)
+            response = self.session.get(url, params=params, timeout=LINKEDIN_TIMEOUT)
 
             if response.status_code == 200:
-                elements = response.json().get('elements', [])
+                elements = _loads(response).get('elements', [])
                 data = []
 
                 for elem in elements:
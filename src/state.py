@@ -5,40 +5,10 @@ from src.db_config import get_programmed_posts, init_db
 
 def init_states():
     """Inicializa todos los session_state necesarios para la aplicación."""
-    # Asegurar que la base de datos esté inicializada antes de cualquier operación
-    init_db()
-
-    # Estados para la navegación y datos
-    if 'page' not in st.session_state: st.session_state.page = 'Home'
-    if 'selected_platforms' not in st.session_state: st.session_state.selected_platforms = []
-    if 'results' not in st.session_state: st.session_state.results = {}
-    if 'env_vars_checked' not in st.session_state: st.session_state.env_vars_checked = False
-    if 'preview_video_path' not in st.session_state: st.session_state.preview_video_path = None
-    if 'selected_pub_id' not in st.session_state: st.session_state.selected_pub_id = None
-    if 'platforms_with_content' not in st.session_state: st.session_state.platforms_with_content = set()
-
-    if "selected_event_id" not in st.session_state:
-        st.session_state.selected_event_id = None
-    if "programmed_posts_cache" not in st.session_state:
-        st.session_state.programmed_posts_cache = get_programmed_posts()
-
-    if 'force_page_rerun' not in st.session_state:
-        st.session_state.force_page_rerun = False
-
-    # Estado para el formulario de generación
-    if 'form_data' not in st.session_state:
-        st.session_state.form_data = {
-            "objetivo": "", "audiencia": "", "mensaje": "",
-            "tono": "", "cta": "", "keywords": [], "logos": []
-        }
-
-    # Configuración de OpenAI
-    if 'openai_configured' not in st.session_state:
-        if configurar_openai():
-            st.session_state.openai_configured = True
-        else:
-            st.session_state.openai_configured = False
-            st.error("Error al configurar OpenAI. Revisa la OPENAI_API_KEY.")
+    # La inicialización de estados solo se ejecuta una vez por sesión
+    if not st.session_state.setdefault('_states_inited', False):
+        _init_session_defaults()
+        st.session_state['_states_inited'] = True
 
     # Estilos CSS para toda la app
     st.markdown("""
@@ -63,3 +33,37 @@ def init_states():
     observer.observe(document.body, { attributes: true, attributeFilter: ['class'] });
     </script>
     """, unsafe_allow_html=True)
+
+
+def _init_session_defaults():
+    """Crea las claves de session_state con sus valores por defecto."""
+    # Asegurar que la base de datos esté inicializada antes de cualquier operación
+    init_db()
+
+    # Estados para la navegación y datos
+    st.session_state.setdefault('page', 'Home')
+    st.session_state.setdefault('selected_platforms', [])
+    st.session_state.setdefault('results', {})
+    st.session_state.setdefault('env_vars_checked', False)
+    st.session_state.setdefault('preview_video_path', None)
+    st.session_state.setdefault('selected_pub_id', None)
+    st.session_state.setdefault('platforms_with_content', set())
+    st.session_state.setdefault('selected_event_id', None)
+    st.session_state.setdefault('force_page_rerun', False)
+
+    if "programmed_posts_cache" not in st.session_state:
+        st.session_state.programmed_posts_cache = get_programmed_posts()
+
+    # Estado para el formulario de generación
+    st.session_state.setdefault('form_data', {
+        "objetivo": "", "audiencia": "", "mensaje": "",
+        "tono": "", "cta": "", "keywords": [], "logos": []
+    })
+
+    # Configuración de OpenAI
+    if 'openai_configured' not in st.session_state:
+        if configurar_openai():
+            st.session_state.openai_configured = True
+        else:
+            st.session_state.openai_configured = False
+            st.error("Error al configurar OpenAI. Revisa la OPENAI_API_KEY.")
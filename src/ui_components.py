@@ -269,7 +269,8 @@ def display_post_editor(post_id):
                         update_post(post_id, **update_data)
                         link_media_to_post(post_id, st.session_state.get(f"selected_media_ids_{post_id}", []))
 
-                        st.cache_data.clear()
+                        get_programmed_posts.clear()
+                        get_unprogrammed_posts.clear()
 
                         for _k in [f"edited_title_{post_id}", f"edited_asunto_{post_id}", f"edited_content_{post_id}",
                                    f"edited_content_html_{post_id}", f"post_contacts_{post_id}",
@@ -299,7 +300,8 @@ def display_post_editor(post_id):
                     update_post(post_id, **update_data)
                     link_media_to_post(post_id, st.session_state.get(f"selected_media_ids_{post_id}", []))
 
-                    st.cache_data.clear()
+                    get_programmed_posts.clear()
+                    get_unprogrammed_posts.clear()
 
                     for _k in [f"edited_title_{post_id}", f"edited_asunto_{post_id}", f"edited_content_{post_id}",
                                f"edited_content_html_{post_id}", f"post_contacts_{post_id}",